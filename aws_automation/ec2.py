@@ -1,9 +1,54 @@
 from tabulate import tabulate
 from botocore.exceptions import ClientError, BotoCoreError  # Handle AWS/boto3 errors
+from botocore.exceptions import WaiterError
 from aws_automation.utils import logger
 
 log = logger()
 
+EC2_PAGE_SIZE = 1000
+
+
+def configure(tuning):
+    # Apply the tuning section of config.yaml to EC2 listings
+    global EC2_PAGE_SIZE
+    EC2_PAGE_SIZE = tuning["ec2_page_size"]
+
+
+# Launch a new EC2 instance from the aws section of config.yaml
+def create_instance(ec2_resource, config):
+    try:
+        log.info("Launching EC2 instance...")
+        instance = ec2_resource.create_instances(
+            ImageId=config["aws"]["ami_id"],
+            InstanceType=config["aws"]["instance_type"],
+            KeyName=config["aws"]["key_name"],
+            SecurityGroups=[config["aws"]["security_group_name"]],
+            MinCount=1,
+            MaxCount=1,
+            TagSpecifications=[
+                {
+                    "ResourceType": "instance",
+                    "Tags": [{"Key": "Name", "Value": config["aws"]["instance_name"]}],
+                }
+            ],
+        )[0]
+
+        log.info("Waiting for instance to run...")
+        instance.wait_until_running()
+        instance.load()
+
+        log.info("✅ Instance created successfully!")
+        log.info(f"Instance ID: {instance.id}")
+        log.info(f"Public IP Address: {instance.public_ip_address}")
+        log.info(f"State: {instance.state['Name']}")
+
+        return instance
+
+    except ClientError as e:
+        log.error(f"❌ AWS Client Error: {e.response['Error']['Message']}")
+    except BotoCoreError as e:
+        log.error(f"❌ Boto3 Core Error: {str(e)}")
+
 
 # Start an EC2 instance
 def start_instance(ec2_client, instance_id):
@@ -44,16 +89,17 @@ def stop_instance(ec2_client, instance_id):
 
 
 # Terminate an EC2 instance
-def terminate_instance(ec2_client, instance_id):
+def terminate_instance(ec2_client, instance_id, confirm=True):
     # Terminate an EC2 instance permanently.
 
     try:
-        confirm = input(
-            f"⚠️ Are you sure you want to permanently TERMINATE instance '{instance_id}'? (yes/no): "
-        )
-        if confirm.lower() != "yes":
-            log.info("Termination cancelled by user.")
-            return None
+        if confirm:
+            answer = input(
+                f"⚠️ Are you sure you want to permanently TERMINATE instance '{instance_id}'? (yes/no): "
+            )
+            if answer.lower() != "yes":
+                log.info("Termination cancelled by user.")
+                return None
 
         log.info(f"Terminating instance {instance_id}...")
         response = ec2_client.terminate_instances(InstanceIds=[instance_id])
@@ -70,16 +116,37 @@ def terminate_instance(ec2_client, instance_id):
         log.error(f"BotoCoreError while terminating instance: {str(e)}")
 
 
+# Block until an instance reaches the given state (running, stopped, terminated)
+def wait_for_instance(ec2_client, instance_id, state="running"):
+    try:
+        log.info(f"Waiting for instance {instance_id} to be {state}...")
+        ec2_client.get_waiter(f"instance_{state}").wait(InstanceIds=[instance_id])
+        log.info(f"✅ Instance {instance_id} is {state}.")
+        return True
+    except WaiterError as e:
+        log.error(f"❌ Instance {instance_id} did not become {state}: {str(e)}")
+        return False
+    except ClientError as e:
+        log.error(
+            f"ClientError while waiting for instance: {e.response['Error']['Message']}"
+        )
+        return False
+    except BotoCoreError as e:
+        log.error(f"BotoCoreError while waiting for instance: {str(e)}")
+        return False
+
+
 # List all running EC2 instances
 def list_running_instances(ec2_client):
 
     try:
         instances = []  # List to store instance info
-        response = ec2_client.describe_instances(
-            Filters=[{"Name": "instance-state-name", "Values": ["running"]}]
+        pages = ec2_client.get_paginator("describe_instances").paginate(
+            Filters=[{"Name": "instance-state-name", "Values": ["running"]}],
+            PaginationConfig={"PageSize": EC2_PAGE_SIZE},
         )
 
-        for reservation in response["Reservations"]:
+        for reservation in pages.search("Reservations[]"):
             for instance in reservation["Instances"]:
                 instances.append(
                     {
@@ -0,0 +1,181 @@
+import base64
+import hashlib
+import json
+import mmap
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import BotoCoreError, ClientError
+from tabulate import tabulate
+
+from aws_automation.utils import logger
+
+try:
+    from awscrt import checksums as crt_checksums
+except ImportError:  # CRC32C needs the optional awscrt package
+    crt_checksums = None
+
+log = logger()
+
+# Matches boto3's default TransferConfig, so multipart ETags line up
+PART_SIZE = 8 * 1024**2
+
+# algorithm -> function returning the raw digest of a buffer. hashlib and
+# zlib release the GIL on large buffers, so parts hash in true parallel.
+ALGORITHMS = {
+    "md5": lambda data: hashlib.md5(data).digest(),
+    "sha256": lambda data: hashlib.sha256(data).digest(),
+    "crc32": lambda data: zlib.crc32(data).to_bytes(4, "big"),
+}
+if crt_checksums:
+    ALGORITHMS["crc32c"] = lambda data: crt_checksums.crc32c(data).to_bytes(4, "big")
+
+
+class _Crc:
+    # hashlib-style incremental wrapper for zlib/awscrt CRC functions
+    def __init__(self, func):
+        self.func = func
+        self.value = 0
+
+    def update(self, data):
+        self.value = self.func(data, self.value)
+
+    def digest(self):
+        return self.value.to_bytes(4, "big")
+
+
+# algorithm -> factory for an incremental hasher, to digest data as it streams
+HASHERS = {
+    "md5": hashlib.md5,
+    "sha256": hashlib.sha256,
+    "crc32": lambda: _Crc(zlib.crc32),
+}
+if crt_checksums:
+    HASHERS["crc32c"] = lambda: _Crc(crt_checksums.crc32c)
+
+# algorithm -> (head_object field, ChecksumAlgorithm request value)
+CHECKSUM_FIELDS = {
+    "sha256": ("ChecksumSHA256", "SHA256"),
+    "crc32": ("ChecksumCRC32", "CRC32"),
+    "crc32c": ("ChecksumCRC32C", "CRC32C"),
+}
+
+
+def hash_parts(fileobj, algorithm, part_size=PART_SIZE, max_workers=4):
+    # Digest each part_size slice of an open binary file on a thread pool.
+    # The file is memory-mapped and slices are memoryviews, so no part is
+    # copied into Python memory. The file position is left untouched, so the
+    # same file can be uploaded while it is hashed.
+    digest = ALGORITHMS[algorithm]
+    if os.fstat(fileobj.fileno()).st_size == 0:
+        return [digest(b"")]
+
+    with mmap.mmap(fileobj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            starts = range(0, len(mapped), part_size)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(
+                    executor.map(lambda s: digest(view[s : s + part_size]), starts)
+                )
+        finally:
+            view.release()
+
+
+def _encode(raw, algorithm):
+    # ETags are hex, S3 additional checksums are base64
+    if algorithm == "md5":
+        return raw.hex()
+    return base64.b64encode(raw).decode()
+
+
+def _combine(parts, algorithm):
+    # Multipart ETags and composite checksums hash the concatenated part digests
+    combined = ALGORITHMS[algorithm](b"".join(parts))
+    return f"{_encode(combined, algorithm)}-{len(parts)}"
+
+
+def _remote_value(s3_client, bucket_name, key, algorithm):
+    if algorithm == "md5":
+        head = s3_client.head_object(Bucket=bucket_name, Key=key)
+        # SSE-KMS (incl. DSSE) and SSE-C ETags are not an MD5 of the data
+        if head.get("ServerSideEncryption", "").startswith("aws:kms") or head.get(
+            "SSECustomerAlgorithm"
+        ):
+            return None
+        return head["ETag"].strip('"')
+    head = s3_client.head_object(Bucket=bucket_name, Key=key, ChecksumMode="ENABLED")
+    return head.get(CHECKSUM_FIELDS[algorithm][0])
+
+
+def first_part_size(s3_client, bucket_name, key, default):
+    try:
+        head = s3_client.head_object(Bucket=bucket_name, Key=key, PartNumber=1)
+        return head["ContentLength"]
+    except (ClientError, BotoCoreError):
+        return default
+
+
+def verify_object(
+    s3_client,
+    bucket_name,
+    key,
+    fileobj,
+    algorithm="md5",
+    part_size=PART_SIZE,
+    parts=None,
+    max_workers=4,
+    full_digest=None,
+):
+    # Compare a local file against the object's ETag or stored checksum.
+    # parts (and full_digest, the digest of the whole file) may be computed
+    # while the data was moving; fileobj is None when the data was a stream.
+    row = {"Object": key, "Algorithm": algorithm, "Expected": None, "Actual": None}
+    expected = _remote_value(s3_client, bucket_name, key, algorithm)
+    if not expected:
+        row["Status"] = "UNAVAILABLE"
+        return row
+    row["Expected"] = expected
+
+    suffixed = "-" in expected
+    recount = suffixed and len(parts or []) != int(expected.split("-")[1])
+    if fileobj is not None and (parts is None or recount):
+        part_size = first_part_size(s3_client, bucket_name, key, part_size)
+        parts = hash_parts(fileobj, algorithm, part_size, max_workers)
+
+    composite = _combine(parts, algorithm)
+    if suffixed:
+        actual = composite
+    elif len(parts) == 1:
+        actual = _encode(parts[0], algorithm)
+    elif composite.startswith(expected + "-"):
+        # Some endpoints report composite checksums without the -N suffix
+        actual = expected
+    elif full_digest is not None:
+        # Single PUT, or a full-object checksum over a multipart upload
+        actual = _encode(full_digest, algorithm)
+    else:
+        size = os.fstat(fileobj.fileno()).st_size
+        actual = _encode(hash_parts(fileobj, algorithm, max(size, 1), 1)[0], algorithm)
+
+    row["Actual"] = actual
+    row["Status"] = "OK" if actual == expected else "MISMATCH"
+    return row
+
+
+def log_report(report, report_path=None):
+    if not report:
+        return
+    log.info(
+        "Integrity report:\n"
+        + tabulate(
+            [[r["Object"], r["Algorithm"], r["Status"]] for r in report],
+            headers=["Object", "Algorithm", "Status"],
+            tablefmt="fancy_grid",
+        )
+    )
+    if report_path:
+        with open(report_path, "w") as file:
+            json.dump(report, file, indent=2)
+        log.info(f"📝 Integrity report written to {report_path}")
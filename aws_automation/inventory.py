@@ -0,0 +1,200 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+
+from botocore.exceptions import BotoCoreError, ClientError
+from tabulate import tabulate
+
+from aws_automation.utils import logger
+
+log = logger()
+
+DEFAULT_TTL = 60
+# Instance records are stored as positional lists in this order
+FIELDS = ("Type", "Public IP", "Private IP", "State", "Name")
+# DescribeInstances accepts a limited number of IDs per call
+DESCRIBE_BATCH_SIZE = 200
+
+
+def account_key(session):
+    # Identify the credentials without a network call: the credential profile,
+    # plus a digest of the access key id when keys come from the environment
+    key = session.profile_name or "default"
+    access_key = os.environ.get("AWS_ACCESS_KEY_ID")
+    if access_key:
+        key += "-" + hashlib.sha256(access_key.encode()).hexdigest()[:12]
+    return key
+
+
+def default_cache_path(region_name, account, profile=None):
+    # One snapshot per account, config profile and region, so switching any
+    # of them never diffs against another environment's instances
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    parts = [account] + ([profile] if profile else []) + [region_name]
+    name = re.sub(r"[^\w.-]", "_", "-".join(parts))
+    return os.path.join(cache_dir, "aws-automation", f"inventory-{name}.json.gz")
+
+
+def _record(instance):
+    tags = {t["Key"]: t["Value"] for t in instance.get("Tags", [])}
+    return [
+        instance["InstanceType"],
+        instance.get("PublicIpAddress", "N/A"),
+        instance.get("PrivateIpAddress", "N/A"),
+        instance["State"]["Name"],
+        tags.get("Name", ""),
+    ]
+
+
+def load_inventory(cache_path):
+    try:
+        with gzip.open(cache_path, "rt") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def save_inventory(cache_path, inventory):
+    # Compact gzip'd JSON, written to a temp file and swapped in atomically
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with gzip.open(tmp_path, "wt") as file:
+        json.dump(inventory, file, separators=(",", ":"))
+    os.replace(tmp_path, cache_path)
+
+
+def _describe(ec2_client, instance_ids=None):
+    # Full snapshot, or just the given IDs, as {instance_id: record}
+    records = {}
+    paginator = ec2_client.get_paginator("describe_instances")
+    if instance_ids is None:
+        batches = [{}]
+    else:
+        ids = sorted(instance_ids)
+        batches = [
+            {"InstanceIds": ids[i : i + DESCRIBE_BATCH_SIZE]}
+            for i in range(0, len(ids), DESCRIBE_BATCH_SIZE)
+        ]
+    for kwargs in batches:
+        for reservation in paginator.paginate(**kwargs).search("Reservations[]"):
+            for instance in reservation["Instances"]:
+                records[instance["InstanceId"]] = _record(instance)
+    return records
+
+
+def _states(ec2_client):
+    # One cheap call per page that covers every instance's state
+    states = {}
+    paginator = ec2_client.get_paginator("describe_instance_status")
+    for page in paginator.paginate(IncludeAllInstances=True):
+        for status in page.get("InstanceStatuses", []):
+            states[status["InstanceId"]] = status["InstanceState"]["Name"]
+    return states
+
+
+def diff_inventory(old, new):
+    # Compare two {instance_id: record} maps
+    changes = {"added": [], "removed": [], "changed": []}
+    for instance_id in sorted(new.keys() - old.keys()):
+        changes["added"].append(instance_id)
+    for instance_id in sorted(old.keys() - new.keys()):
+        changes["removed"].append(instance_id)
+    for instance_id in sorted(old.keys() & new.keys()):
+        fields = {
+            field: (before, after)
+            for field, before, after in zip(FIELDS, old[instance_id], new[instance_id])
+            if before != after
+        }
+        if fields:
+            changes["changed"].append((instance_id, fields))
+    return changes
+
+
+def refresh_inventory(ec2_client, cache_path, ttl=DEFAULT_TTL, full=False):
+    # Return (inventory, changes). A cache younger than ttl is used as is.
+    # Otherwise instance states are polled and only new or changed instances
+    # are re-described. full=True forces a complete DescribeInstances.
+    cached = load_inventory(cache_path)
+    now = time.time()
+    if cached and not full and now - cached["fetched_at"] < ttl:
+        return cached, None
+
+    old = cached["instances"] if cached else {}
+    if cached and not full:
+        states = _states(ec2_client)
+        stale = {
+            instance_id
+            for instance_id, state in states.items()
+            if instance_id not in old
+            or old[instance_id][FIELDS.index("State")] != state
+        }
+        instances = {i: r for i, r in old.items() if i in states}
+        if stale:
+            instances.update(_describe(ec2_client, stale))
+    else:
+        instances = _describe(ec2_client)
+
+    inventory = {"fetched_at": now, "instances": instances}
+    save_inventory(cache_path, inventory)
+    return inventory, diff_inventory(old, instances)
+
+
+def running_instances(inventory):
+    return [
+        {"Instance ID": instance_id, **dict(zip(FIELDS[:4], record[:4]))}
+        for instance_id, record in sorted(inventory["instances"].items())
+        if record[FIELDS.index("State")] == "running"
+    ]
+
+
+def list_cached_instances(ec2_client, cache_path, ttl=DEFAULT_TTL):
+    try:
+        inventory, _ = refresh_inventory(ec2_client, cache_path, ttl)
+    except ClientError as e:
+        log.error(
+            f"ClientError while refreshing inventory: {e.response['Error']['Message']}"
+        )
+        return []
+    except BotoCoreError as e:
+        log.error(f"BotoCoreError while refreshing inventory: {str(e)}")
+        return []
+
+    instances = running_instances(inventory)
+    age = time.time() - inventory["fetched_at"]
+    if instances:
+        table = tabulate(instances, headers="keys", tablefmt="fancy_grid")
+        log.info(f"Running EC2 instances (cached {age:.0f}s ago):\n{table}")
+    else:
+        log.info(f"No running instances found (cached {age:.0f}s ago).")
+    return instances
+
+
+def show_inventory_diff(ec2_client, cache_path, full=False):
+    try:
+        _, changes = refresh_inventory(ec2_client, cache_path, ttl=0, full=full)
+    except ClientError as e:
+        log.error(
+            f"ClientError while refreshing inventory: {e.response['Error']['Message']}"
+        )
+        return None
+    except BotoCoreError as e:
+        log.error(f"BotoCoreError while refreshing inventory: {str(e)}")
+        return None
+
+    rows = [[i, "added", ""] for i in changes["added"]]
+    rows += [[i, "removed", ""] for i in changes["removed"]]
+    rows += [
+        [i, "changed", ", ".join(f"{f}: {a} → {b}" for f, (a, b) in fields.items())]
+        for i, fields in changes["changed"]
+    ]
+    if rows:
+        table = tabulate(
+            rows, headers=["Instance ID", "Change", "Details"], tablefmt="fancy_grid"
+        )
+        log.info(f"Inventory changes since last snapshot:\n{table}")
+    else:
+        log.info("No inventory changes since last snapshot.")
+    return changes
@@ -0,0 +1,246 @@
+import codecs
+import csv
+import json
+import operator
+import re
+import sys
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from aws_automation.utils import logger
+
+log = logger()
+
+# Size of each ranged GET used by the client-side fallback
+RANGE_SIZE = 8 * 1024**2
+
+_SELECT_RE = re.compile(
+    r"^\s*select\s+(?P<cols>.+?)\s+from\s+s3object(?:\[\*\])?"
+    r"(?:\s+(?:as\s+)?(?!where\b|limit\b)(?P<alias>\w+))?"
+    r"(?:\s+where\s+(?P<where>.+?))?"
+    r"(?:\s+limit\s+(?P<limit>\d+))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_REF = r'(?:\w+\.)?(?:"[^"]+"|\w+)'
+_CONDITION_RE = re.compile(
+    rf"\s*(?:cast\s*\(\s*(?P<cast>{_REF})\s+as\s+\w+\s*\)|(?P<col>{_REF}))"
+    r"\s*(?P<op><=|>=|<>|!=|=|<|>)\s*"
+    r"(?P<val>'(?:[^']|'')*'|-?\d+(?:\.\d+)?)\s*",
+    re.IGNORECASE,
+)
+_AND_RE = re.compile(r"and\b", re.IGNORECASE)
+_PROJECTION_RE = re.compile(rf"\s*{_REF}\s*")
+_OPS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_SERIALIZATION = {
+    "csv": (
+        {"CSV": {"FileHeaderInfo": "USE"}},
+        {"CSV": {}},
+    ),
+    "json": (
+        {"JSON": {"Type": "LINES"}},
+        {"JSON": {"RecordDelimiter": "\n"}},
+    ),
+}
+
+
+def _column(ref, alias):
+    # 's."Last Name"' -> 'Last Name', 'age' -> 'age'
+    if alias and ref.lower().startswith(alias.lower() + "."):
+        ref = ref[len(alias) + 1 :]
+    return ref.strip('"')
+
+
+def parse_query(expression):
+    # Parse the S3 Select subset the client-side filter understands:
+    # SELECT <*|cols> FROM S3Object [alias] [WHERE a op b [AND ...]] [LIMIT n]
+    match = _SELECT_RE.match(expression)
+    if not match:
+        raise ValueError(f"Unsupported query: {expression}")
+    alias = match["alias"]
+
+    columns = None
+    if match["cols"].strip() != "*":
+        columns = []
+        for col in match["cols"].split(","):
+            # Aggregates and expressions would read as unknown column names
+            if not _PROJECTION_RE.fullmatch(col):
+                raise ValueError(f"Unsupported projection: {col.strip()}")
+            columns.append(_column(col.strip(), alias))
+
+    conditions = []
+    where = match["where"] or ""
+    pos = 0
+    while pos < len(where):
+        cond = _CONDITION_RE.match(where, pos)
+        if not cond:
+            raise ValueError(f"Unsupported WHERE clause: {where}")
+        value = cond["val"]
+        if value.startswith("'"):
+            value = value[1:-1].replace("''", "'")
+        else:
+            value = float(value)
+        column = _column(cond["cast"] or cond["col"], alias)
+        conditions.append((column, _OPS[cond["op"]], value))
+        pos = cond.end()
+        if pos < len(where):
+            joiner = _AND_RE.match(where, pos)
+            if not joiner:
+                raise ValueError(f"Only AND is supported in WHERE: {where}")
+            pos = joiner.end()
+
+    limit = int(match["limit"]) if match["limit"] else None
+    return columns, conditions, limit
+
+
+def _matches(record, conditions):
+    for column, op, value in conditions:
+        field = record.get(column)
+        if field is None:
+            return False
+        if isinstance(value, float):
+            try:
+                field = float(field)
+            except (TypeError, ValueError):
+                return False
+        else:
+            field = str(field)
+        if not op(field, value):
+            return False
+    return True
+
+
+def iter_lines(s3_client, bucket_name, key, range_size=RANGE_SIZE):
+    # Stream an object line by line with ranged GETs, holding at most one
+    # range plus a partial line in memory.
+    size = s3_client.head_object(Bucket=bucket_name, Key=key)["ContentLength"]
+    pending = b""
+    for start in range(0, size, range_size):
+        end = min(start + range_size, size) - 1
+        response = s3_client.get_object(
+            Bucket=bucket_name, Key=key, Range=f"bytes={start}-{end}"
+        )
+        *lines, pending = (pending + response["Body"].read()).split(b"\n")
+        for line in lines:
+            yield line.decode().rstrip("\r")
+    if pending:
+        yield pending.decode().rstrip("\r")
+
+
+def _iter_records(lines, input_format):
+    if input_format == "json":
+        for line in lines:
+            if line.strip():
+                yield json.loads(line), None
+        return
+
+    rows = csv.reader(lines)
+    header = next(rows, None)
+    if header is None:
+        return
+    for row in rows:
+        record = dict(zip(header, row))
+        # S3 Select also lets CSV columns be addressed by position (_1, _2...)
+        record.update({f"_{i}": v for i, v in enumerate(row, start=1)})
+        yield record, row
+
+
+def filter_object(
+    s3_client, bucket_name, key, expression, input_format="csv", out=None
+):
+    # Client-side fallback: evaluate the query over a ranged, streamed read.
+    out = out or sys.stdout
+    columns, conditions, limit = parse_query(expression)
+    lines = iter_lines(s3_client, bucket_name, key)
+    writer = csv.writer(out, lineterminator="\n")
+    emitted = 0
+
+    for record, row in _iter_records(lines, input_format):
+        if limit is not None and emitted >= limit:
+            break
+        if not _matches(record, conditions):
+            continue
+        if input_format == "json":
+            if columns:
+                record = {c: record.get(c) for c in columns}
+            out.write(json.dumps(record) + "\n")
+        else:
+            writer.writerow([record.get(c, "") for c in columns] if columns else row)
+        emitted += 1
+    return emitted
+
+
+def _start_select(s3_client, bucket_name, key, expression, input_format):
+    input_serialization, output_serialization = _SERIALIZATION[input_format]
+    return s3_client.select_object_content(
+        Bucket=bucket_name,
+        Key=key,
+        Expression=expression,
+        ExpressionType="SQL",
+        InputSerialization=input_serialization,
+        OutputSerialization=output_serialization,
+    )
+
+
+def _stream_select(response, out):
+    # Write S3 Select record events to out as they arrive.
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for event in response["Payload"]:
+        if "Records" in event:
+            out.write(decoder.decode(event["Records"]["Payload"]))
+    out.write(decoder.decode(b"", final=True))
+
+
+def query_object(
+    s3_client,
+    bucket_name,
+    key,
+    expression,
+    input_format="csv",
+    use_select=True,
+    out=None,
+):
+    # Push the query down to S3 Select when the service accepts it, otherwise
+    # filter a streamed ranged read on the client. Records go to out (stdout).
+    out = out or sys.stdout
+    if input_format not in _SERIALIZATION:
+        log.error(f"❌ Unsupported input format '{input_format}'.")
+        return False
+
+    response = None
+    if use_select:
+        try:
+            response = _start_select(
+                s3_client, bucket_name, key, expression, input_format
+            )
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code in ("NoSuchKey", "NoSuchBucket", "404"):
+                log.error(f"❌ Object s3://{bucket_name}/{key} does not exist.")
+                return False
+            log.info(f"S3 Select unavailable ({code}), filtering client-side.")
+        except BotoCoreError as e:
+            log.info(f"S3 Select unavailable ({str(e)}), filtering client-side.")
+
+    try:
+        if response is not None:
+            _stream_select(response, out)
+        else:
+            filter_object(s3_client, bucket_name, key, expression, input_format, out)
+        return True
+    except ValueError as e:
+        log.error(f"❌ {str(e)}")
+        return False
+    except ClientError as e:
+        log.error(f"❌ Query error: {e.response['Error']['Message']}")
+        return False
+    except BotoCoreError as e:
+        log.error(f"❌ Query error: {str(e)}")
+        return False
@@ -0,0 +1,149 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from tabulate import tabulate
+
+from aws_automation.utils import logger, run_concurrently
+
+log = logger()
+
+DEFAULT_USER = "ec2-user"
+# Seconds allowed for each host, connection included
+DEFAULT_TIMEOUT = 60
+CONNECT_TIMEOUT = 10
+
+
+def default_key_path(key_name):
+    # EC2 key pairs are downloaded as <key_name>.pem
+    return os.path.expanduser(os.path.join("~", ".ssh", f"{key_name}.pem"))
+
+
+def select_hosts(instances, private=False):
+    # (instance_id, ip) for each instance, as rows from list_running_instances.
+    # Public IPs are preferred unless private=True; instances without a usable
+    # address are skipped.
+    hosts = []
+    for instance in instances:
+        ips = [instance.get("Private IP")]
+        if not private:
+            ips.insert(0, instance.get("Public IP"))
+        ip = next((ip for ip in ips if ip and ip != "N/A"), None)
+        if ip:
+            hosts.append((instance["Instance ID"], ip))
+        else:
+            log.warning(f"⚠️ {instance['Instance ID']} has no reachable IP, skipped.")
+    return hosts
+
+
+def ssh_command(host, command, user, key_path, ssh_binary="ssh"):
+    # BatchMode makes a missing key or host prompt fail instead of hanging
+    return [
+        ssh_binary,
+        "-i",
+        key_path,
+        "-o",
+        "BatchMode=yes",
+        "-o",
+        "StrictHostKeyChecking=accept-new",
+        "-o",
+        f"ConnectTimeout={CONNECT_TIMEOUT}",
+        f"{user}@{host}",
+        command,
+    ]
+
+
+def _run_on_host(argv, label, timeout, out, lock):
+    # Run one command, writing its output to out line by line as it arrives,
+    # prefixed with label. The process is killed once timeout expires.
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        argv,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    expired = threading.Event()
+
+    def kill():
+        expired.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        for line in proc.stdout:
+            with lock:
+                out.write(f"[{label}] {line.rstrip()}\n")
+                out.flush()
+        exit_code = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+    return exit_code, expired.is_set(), time.monotonic() - started
+
+
+def run_on_instances(
+    instances,
+    command,
+    key_path,
+    user=DEFAULT_USER,
+    private=False,
+    max_workers=10,
+    timeout=DEFAULT_TIMEOUT,
+    ssh_binary="ssh",
+    out=None,
+):
+    # Run command over SSH on every instance, max_workers hosts at a time.
+    # Returns one report row per host, or [] if there was nothing to run on.
+    out = out or sys.stdout
+    lock = threading.Lock()
+    hosts = select_hosts(instances, private)
+    if not hosts:
+        log.info("No instances to run on.")
+        return []
+
+    log.info(f"🖥️ Running '{command}' on {len(hosts)} instance(s)...")
+
+    def run(host):
+        instance_id, ip = host
+        argv = ssh_command(ip, command, user, key_path, ssh_binary)
+        return _run_on_host(argv, instance_id, timeout, out, lock)
+
+    report = []
+    for (instance_id, ip), result, error in run_concurrently(run, hosts, max_workers):
+        row = {"Instance ID": instance_id, "Host": ip}
+        if error:
+            row.update(Status="ERROR", Exit=None, Duration=None)
+            log.error(f"❌ [{instance_id}] Could not run ssh: {str(error)}")
+        else:
+            exit_code, timed_out, duration = result
+            status = "TIMEOUT" if timed_out else "OK" if exit_code == 0 else "FAILED"
+            row.update(Status=status, Exit=exit_code, Duration=duration)
+        report.append(row)
+
+    report.sort(key=lambda r: r["Instance ID"])
+    failed = sum(r["Status"] != "OK" for r in report)
+    log.info(
+        f"{'✅' if not failed else '⚠️'} {len(report) - failed}/{len(report)} "
+        "host(s) succeeded:\n"
+        + tabulate(
+            [
+                [
+                    r["Instance ID"],
+                    r["Host"],
+                    r["Status"],
+                    "-" if r["Exit"] is None else r["Exit"],
+                    "-" if r["Duration"] is None else f"{r['Duration']:.2f}s",
+                ]
+                for r in report
+            ],
+            headers=["Instance ID", "Host", "Status", "Exit", "Duration"],
+            tablefmt="fancy_grid",
+        )
+    )
+    return report
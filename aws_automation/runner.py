@@ -0,0 +1,412 @@
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import boto3
+import yaml
+from tabulate import tabulate
+
+from aws_automation import ec2, remote, s3
+from aws_automation.utils import TUNING_DEFAULTS, logger
+
+log = logger()
+
+DEFAULT_MAX_WORKERS = 4
+
+
+# ---------- Actions ---------- #
+# Each action takes the shared clients and config plus the step's args, and
+# returns True on success.
+def _workers(config, workers):
+    # A step's thread budget is its share of tuning.max_workers (set by
+    # run_plan); an explicit workers arg may lower it but never raise it.
+    budget = config.get("tuning", TUNING_DEFAULTS)["max_workers"]
+    return min(workers or budget, budget)
+
+
+def _create(clients, config, **overrides):
+    # boto3 resources are not thread-safe, so each step builds its own
+    ec2_client = clients["ec2"]
+    ec2_resource = boto3.session.Session().resource(
+        "ec2",
+        region_name=ec2_client.meta.region_name,
+        config=ec2_client.meta.config,
+    )
+    step_config = {**config, "aws": {**config["aws"], **overrides}}
+    return ec2.create_instance(ec2_resource, step_config) is not None
+
+
+def _start(clients, config, instance_id):
+    return ec2.start_instance(clients["ec2"], instance_id) is not None
+
+
+def _stop(clients, config, instance_id):
+    return ec2.stop_instance(clients["ec2"], instance_id) is not None
+
+
+def _terminate(clients, config, instance_id):
+    # The plan as a whole was confirmed before it started
+    return (
+        ec2.terminate_instance(clients["ec2"], instance_id, confirm=False) is not None
+    )
+
+
+def _wait(clients, config, instance_id, state="running"):
+    return ec2.wait_for_instance(clients["ec2"], instance_id, state)
+
+
+def _list(clients, config):
+    ec2.list_running_instances(clients["ec2"])
+    return True
+
+
+def _exec(
+    clients,
+    config,
+    command,
+    instance_ids=None,
+    user=remote.DEFAULT_USER,
+    key_path=None,
+    private=False,
+    timeout=remote.DEFAULT_TIMEOUT,
+    workers=None,
+):
+    instances = ec2.list_running_instances(clients["ec2"])
+    if instance_ids:
+        instances = [i for i in instances if i["Instance ID"] in instance_ids]
+    report = remote.run_on_instances(
+        instances,
+        command,
+        key_path or remote.default_key_path(config["aws"]["key_name"]),
+        user,
+        private,
+        _workers(config, workers),
+        timeout,
+    )
+    return all(r["Status"] == "OK" for r in report)
+
+
+def _s3_create(clients, config, bucket_name=None, region_name=None):
+    return s3.create_bucket(
+        clients["s3"],
+        bucket_name or config["s3"]["bucket_name"],
+        region_name or config["s3"]["region_name"],
+    )
+
+
+def _s3_upload(
+    clients,
+    config,
+    obj_paths,
+    bucket_name=None,
+    compress=None,
+    workers=None,
+    verify=None,
+):
+    return s3.upload_objects(
+        clients["s3"],
+        bucket_name or config["s3"]["bucket_name"],
+        obj_paths,
+        compress,
+        _workers(config, workers),
+        verify,
+    )
+
+
+def _s3_download(
+    clients,
+    config,
+    obj_names,
+    dest=".",
+    bucket_name=None,
+    verify=None,
+    workers=None,
+):
+    return s3.download_objects(
+        clients["s3"],
+        bucket_name or config["s3"]["bucket_name"],
+        obj_names,
+        dest,
+        verify,
+        max_workers=_workers(config, workers),
+    )
+
+
+def _s3_obj_delete(clients, config, obj_names, bucket_name=None):
+    return s3.delete_objects(
+        clients["s3"], bucket_name or config["s3"]["bucket_name"], obj_names
+    )
+
+
+def _s3_obj_list(clients, config, bucket_name=None):
+    s3.list_objects(clients["s3"], bucket_name or config["s3"]["bucket_name"])
+    return True
+
+
+def _s3_bucket_list(clients, config):
+    s3.list_buckets(clients["s3"], config["s3"]["region_name"])
+    return True
+
+
+def _s3_delete(clients, config, bucket_name=None):
+    return s3.delete_bucket(clients["s3"], bucket_name or config["s3"]["bucket_name"])
+
+
+def _s3_copy(
+    clients,
+    config,
+    dest_bucket=None,
+    src_bucket=None,
+    prefix="",
+    dest_prefix="",
+    workers=None,
+    move=False,
+):
+    src_bucket = src_bucket or config["s3"]["bucket_name"]
+    return s3.copy_objects(
+        clients["s3"],
+        src_bucket,
+        dest_bucket or src_bucket,
+        prefix,
+        dest_prefix,
+        _workers(config, workers),
+        delete_source=move,
+    )
+
+
+def _s3_move(clients, config, **args):
+    return _s3_copy(clients, config, move=True, **args)
+
+
+def _s3_du(clients, config, bucket_names=None, depth=1, top=10, workers=None):
+    s3.bucket_usage(
+        clients["s3"],
+        bucket_names or [config["s3"]["bucket_name"]],
+        depth,
+        top,
+        _workers(config, workers),
+    )
+    return True
+
+
+def _s3_expire(
+    clients,
+    config,
+    bucket_name=None,
+    prefix="",
+    older_than_days=None,
+    larger_than=None,
+    smaller_than=None,
+    storage_classes=None,
+    transition_to=None,
+    workers=None,
+):
+    return s3.expire_objects(
+        clients["s3"],
+        bucket_name or config["s3"]["bucket_name"],
+        prefix,
+        older_than_days,
+        larger_than,
+        smaller_than,
+        storage_classes,
+        transition_to,
+        max_workers=_workers(config, workers),
+    )
+
+
+ACTIONS = {
+    "create": _create,
+    "start": _start,
+    "stop": _stop,
+    "terminate": _terminate,
+    "wait": _wait,
+    "list": _list,
+    "exec": _exec,
+    "s3-create": _s3_create,
+    "s3-obj-upload": _s3_upload,
+    "s3-obj-download": _s3_download,
+    "s3-obj-delete": _s3_obj_delete,
+    "s3-obj-list": _s3_obj_list,
+    "s3-bucket-list": _s3_bucket_list,
+    "s3-delete": _s3_delete,
+    "s3-copy": _s3_copy,
+    "s3-move": _s3_move,
+    "s3-du": _s3_du,
+    "s3-expire": _s3_expire,
+}
+
+
+# ---------- Plan Loader ---------- #
+def validate_plan(plan, default_workers=DEFAULT_MAX_WORKERS):
+    # Check a parsed plan and normalise its steps. Raises ValueError.
+    if not isinstance(plan, dict) or not isinstance(plan.get("steps"), list):
+        raise ValueError("Plan must contain a 'steps' list")
+
+    steps = {}
+    for step in plan["steps"]:
+        if not isinstance(step, dict):
+            raise ValueError(f"Step must be a mapping: {step}")
+        name, action = step.get("name"), step.get("action")
+        if not name or not isinstance(name, str):
+            raise ValueError(f"Step needs a string name: {step}")
+        if name in steps:
+            raise ValueError(f"Duplicate step name '{name}'")
+        if not isinstance(action, str) or action not in ACTIONS:
+            raise ValueError(f"Step '{name}' has unknown action '{action}'")
+        args = step.get("args") or {}
+        if not isinstance(args, dict):
+            raise ValueError(f"Step '{name}' args must be a mapping")
+        depends_on = step.get("depends_on") or []
+        if not isinstance(depends_on, list) or not all(
+            isinstance(dep, str) for dep in depends_on
+        ):
+            raise ValueError(f"Step '{name}' depends_on must be a list of step names")
+        try:
+            inspect.signature(ACTIONS[action]).bind(None, None, **args)
+        except TypeError as e:
+            raise ValueError(f"Step '{name}' has invalid args: {e}") from None
+        steps[name] = {
+            "name": name,
+            "action": action,
+            "args": args,
+            "depends_on": list(depends_on),
+        }
+
+    for step in steps.values():
+        for dep in step["depends_on"]:
+            if dep not in steps:
+                raise ValueError(f"Step '{step['name']}' depends on unknown '{dep}'")
+
+    # Kahn's algorithm, only to reject cycles before anything runs
+    remaining = {name: set(step["depends_on"]) for name, step in steps.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between: {', '.join(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    max_workers = plan.get("max_workers", default_workers)
+    if isinstance(max_workers, bool) or not isinstance(max_workers, int):
+        raise ValueError(f"max_workers must be an integer, got {max_workers!r}")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    return {"max_workers": max_workers, "steps": list(steps.values())}
+
+
+def load_plan(plan_path, default_workers=DEFAULT_MAX_WORKERS):
+    try:
+        with open(plan_path, "r") as file:
+            return validate_plan(yaml.safe_load(file), default_workers)
+    except FileNotFoundError:
+        log.error(f"❌ Plan file {plan_path} not found.")
+    except yaml.YAMLError as e:
+        log.error(f"❌ YAML parsing error: {e}")
+    except ValueError as e:
+        log.error(f"❌ Invalid plan: {str(e)}")
+
+
+def show_plan(plan):
+    log.info(
+        f"Plan ({plan['max_workers']} concurrent step(s)):\n"
+        + tabulate(
+            [
+                [s["name"], s["action"], ", ".join(s["depends_on"]) or "-"]
+                for s in plan["steps"]
+            ],
+            headers=["Step", "Action", "Depends On"],
+            tablefmt="fancy_grid",
+        )
+    )
+
+
+# ---------- Scheduler ---------- #
+def _run_step(step, clients, config):
+    started = time.monotonic()
+    try:
+        ok = ACTIONS[step["action"]](clients, config, **step["args"])
+    except Exception as e:
+        log.error(f"❌ [{step['name']}] {step['action']} raised: {str(e)}")
+        ok = False
+    return started, time.monotonic(), bool(ok)
+
+
+def step_budget(plan, config):
+    # Split the process-wide tuning.max_workers budget between the steps
+    # that can run at once. Returns (concurrent steps, threads per step).
+    budget = config.get("tuning", TUNING_DEFAULTS)["max_workers"]
+    concurrent = max(1, min(plan["max_workers"], budget))
+    return concurrent, max(1, budget // concurrent)
+
+
+def run_plan(plan, clients, config):
+    # Run steps as soon as their dependencies succeed, at most max_workers at
+    # a time. A failed step skips everything that (transitively) depends on it.
+    concurrent, per_step = step_budget(plan, config)
+    tuning = config.get("tuning", TUNING_DEFAULTS)
+    config = {**config, "tuning": {**tuning, "max_workers": per_step}}
+    steps = {s["name"]: s for s in plan["steps"]}
+    waiting = {name: set(s["depends_on"]) for name, s in steps.items()}
+    results = {}
+    run_started = time.monotonic()
+
+    def skip_dependents(failed):
+        for name, deps in list(waiting.items()):
+            if failed in deps:
+                del waiting[name]
+                results[name] = {"Status": "SKIPPED", "Start": None, "Duration": None}
+                log.warning(f"⏭️ [{name}] skipped because '{failed}' failed.")
+                skip_dependents(name)
+
+    with ThreadPoolExecutor(max_workers=concurrent) as executor:
+        running = {}
+        while waiting or running:
+            for name in [n for n, deps in waiting.items() if not deps]:
+                del waiting[name]
+                log.info(f"▶️ [{name}] {steps[name]['action']} started")
+                future = executor.submit(_run_step, steps[name], clients, config)
+                running[future] = name
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                started, finished, ok = future.result()
+                results[name] = {
+                    "Status": "OK" if ok else "FAILED",
+                    "Start": started - run_started,
+                    "Duration": finished - started,
+                }
+                if ok:
+                    log.info(f"✅ [{name}] finished in {finished - started:.2f}s")
+                    for deps in waiting.values():
+                        deps.discard(name)
+                else:
+                    log.error(f"❌ [{name}] failed after {finished - started:.2f}s")
+                    skip_dependents(name)
+
+    report = [
+        {"Step": name, "Action": steps[name]["action"], **results[name]}
+        for name in steps
+    ]
+    log.info(
+        f"Plan finished in {time.monotonic() - run_started:.2f}s:\n"
+        + tabulate(
+            [
+                [
+                    r["Step"],
+                    r["Action"],
+                    r["Status"],
+                    "-" if r["Start"] is None else f"+{r['Start']:.2f}s",
+                    "-" if r["Duration"] is None else f"{r['Duration']:.2f}s",
+                ]
+                for r in report
+            ],
+            headers=["Step", "Action", "Status", "Started", "Duration"],
+            tablefmt="fancy_grid",
+        )
+    )
+    return report
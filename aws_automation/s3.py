@@ -1,11 +1,94 @@
+import contextlib
+import json
+import mimetypes
 import os
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, BotoCoreError
 from tabulate import tabulate
-from aws_automation.utils import logger
+from aws_automation.integrity import (
+    ALGORITHMS,
+    CHECKSUM_FIELDS,
+    HASHERS,
+    PART_SIZE,
+    first_part_size,
+    hash_parts,
+    log_report,
+    verify_object,
+)
+from aws_automation.selector import browse_objects
+from aws_automation.utils import logger, run_concurrently
 import questionary
 
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
 log = logger()
 
+CHUNK_SIZE = 1024**2
+# Pin the multipart part size so ETags and composite checksums can be rebuilt
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=PART_SIZE, multipart_chunksize=PART_SIZE
+)
+LIST_PAGE_SIZE = 1000
+
+
+def configure(tuning):
+    # Apply the tuning section of config.yaml to transfers and listings
+    global TRANSFER_CONFIG, LIST_PAGE_SIZE
+    TRANSFER_CONFIG = TransferConfig(
+        multipart_threshold=tuning["multipart_threshold"],
+        multipart_chunksize=tuning["multipart_chunksize"],
+        max_concurrency=tuning["max_workers"],
+    )
+    LIST_PAGE_SIZE = tuning["list_page_size"]
+
+
+def _transfer_config(max_concurrency):
+    # TRANSFER_CONFIG with its own thread count, for callers sharing a budget
+    return TransferConfig(
+        multipart_threshold=TRANSFER_CONFIG.multipart_threshold,
+        multipart_chunksize=TRANSFER_CONFIG.multipart_chunksize,
+        max_concurrency=max(1, max_concurrency),
+    )
+
+
+# Content-Encoding -> (compressor factory, decompressor factory)
+CODECS = {
+    "gzip": (
+        lambda: zlib.compressobj(6, zlib.DEFLATED, 31),
+        lambda: zlib.decompressobj(31),
+    ),
+}
+if zstandard:
+    CODECS["zstd"] = (
+        lambda: zstandard.ZstdCompressor().compressobj(),
+        lambda: zstandard.ZstdDecompressor().decompressobj(),
+    )
+
+# CopyObject refuses sources above 5 GB, larger objects need UploadPartCopy
+MULTIPART_COPY_THRESHOLD = 5 * 1024**3
+COPY_PART_SIZE = 512 * 1024**2
+# DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+# Storage classes whose objects can't be copied until restored
+ARCHIVE_STORAGE_CLASSES = ("GLACIER", "DEEP_ARCHIVE")
+# Headers create_multipart_upload takes explicitly when copying in parts
+COPIED_HEADERS = (
+    "ContentEncoding",
+    "CacheControl",
+    "ContentDisposition",
+    "ContentLanguage",
+)
+# Age histogram buckets for s3-du: (upper bound in days, label)
+AGE_BUCKETS = [(30, "<30d"), (90, "30-90d"), (365, "90d-1y"), (None, ">1y")]
+
 
 def bucket_exists(s3_client, bucket_name):
     try:
@@ -86,18 +169,9 @@ def prompt_select_buckets(s3_client, region_name):
 
 def prompt_select_objects(s3_client, bucket_name):
     try:
-        object_list = list_objects(s3_client, bucket_name, return_list=True)
-        if not object_list:
-            log.warning(f"⚠️ No objects in bucket '{bucket_name}'.")
-            return []
-
-        selected = questionary.checkbox(
-            f"Select object(s) from '{bucket_name}':", choices=object_list
-        ).ask()
-
-        return selected or []
-    except ClientError as e:
-        log.error(f"❌ Failed to fetch object list: {e.response['Error']['Message']}")
+        return browse_objects(s3_client, bucket_name)
+    except (ClientError, BotoCoreError) as e:
+        log.error(f"❌ Failed to fetch object list: {str(e)}")
         return []
 
 
@@ -118,31 +192,206 @@ def create_bucket(s3_client, bucket_name, region_name):
         return False
 
 
-def upload_objects(s3_client, bucket_name, obj_paths):
+class _PartDigests:
+    # Digests each part_size slice of a byte stream, plus the whole stream,
+    # as it is written: the values behind a multipart or single-PUT upload.
+    def __init__(self, algorithm, part_size):
+        self.new = HASHERS[algorithm]
+        self.part_size = part_size
+        self.parts = []
+        self.whole = self.new()
+        self._part, self._filled = None, 0
+
+    def update(self, data):
+        self.whole.update(data)
+        while data:
+            if self._part is None:
+                self._part, self._filled = self.new(), 0
+            take = data[: self.part_size - self._filled]
+            self._part.update(take)
+            self._filled += len(take)
+            data = data[len(take) :]
+            if self._filled == self.part_size:
+                self.parts.append(self._part.digest())
+                self._part = None
+
+    def finish(self):
+        if self._part is not None or not self.parts:
+            self.parts.append((self._part or self.new()).digest())
+            self._part = None
+        return self.parts, self.whole.digest()
+
+
+def _compress_stream(obj_path, codec, sink, digests=None):
+    # Compress obj_path into sink as it is read, feeding the output to digests
+    # too. Closes sink when done so the reader sees EOF; returns the
+    # compressed size.
+    compressor = CODECS[codec][0]()
+    size = 0
+    with sink, open(obj_path, "rb") as src:
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            data = compressor.compress(chunk) if chunk else compressor.flush()
+            if data:
+                sink.write(data)
+                size += len(data)
+                if digests:
+                    digests.update(data)
+            if not chunk:
+                return size
+
+
+def _upload_one(
+    s3_client, bucket_name, obj_path, compress=None, verify=None, config=None
+):
+    config = config or TRANSFER_CONFIG
+    obj_name = os.path.basename(obj_path)
+    log.info(f"⬆️ Uploading {obj_name} to bucket {bucket_name}...")
+    extra_args = {}
+    if verify in CHECKSUM_FIELDS:
+        extra_args["ChecksumAlgorithm"] = CHECKSUM_FIELDS[verify][1]
+    part_size = config.multipart_chunksize
+
+    started = time.monotonic()
+    with contextlib.ExitStack() as stack:
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+        body, hashing, digests = None, None, None
+        if compress:
+            # A compressor thread fills a pipe that the upload drains, so one
+            # file is compressed and uploaded at the same time, with no copy
+            # on disk. The compressed bytes are hashed on their way through.
+            raw = os.path.getsize(obj_path)
+            extra_args["ContentEncoding"] = compress
+            extra_args["ContentType"] = (
+                mimetypes.guess_type(obj_name)[0] or "binary/octet-stream"
+            )
+            extra_args["Metadata"] = {"uncompressed-size": str(raw)}
+            read_fd, write_fd = os.pipe()
+            body = stack.enter_context(os.fdopen(read_fd, "rb"))
+            sink = os.fdopen(write_fd, "wb")
+            digests = _PartDigests(verify, part_size) if verify else None
+            compressing = executor.submit(
+                _compress_stream, obj_path, compress, sink, digests
+            )
+            try:
+                s3_client.upload_fileobj(
+                    body,
+                    bucket_name,
+                    obj_name,
+                    ExtraArgs=extra_args,
+                    Config=config,
+                )
+            finally:
+                body.close()  # unblocks the compressor if the upload failed
+            try:
+                size = compressing.result()
+            except Exception:
+                # The upload saw an early EOF; don't leave a truncated object
+                s3_client.delete_object(Bucket=bucket_name, Key=obj_name)
+                raise
+        else:
+            if verify:
+                # Hash the outgoing bytes in the background while they upload
+                body = stack.enter_context(open(obj_path, "rb"))
+                hashing = executor.submit(hash_parts, body, verify, part_size)
+            s3_client.upload_file(
+                obj_path,
+                bucket_name,
+                obj_name,
+                ExtraArgs=extra_args or None,
+                Config=config,
+            )
+
+        if compress:
+            elapsed = max(time.monotonic() - started, 1e-6)
+            ratio = size / raw if raw else 1.0
+            log.info(
+                f"✅ Uploaded {obj_name} ({compress}): {_human_size(raw)} → "
+                f"{_human_size(size)} ({ratio:.0%}), {_human_size(raw / elapsed)}/s"
+            )
+        else:
+            log.info(f"✅ Uploaded {obj_name}")
+
+        if verify and digests:
+            parts, whole = digests.finish()
+            return verify_object(
+                s3_client,
+                bucket_name,
+                obj_name,
+                None,
+                verify,
+                part_size,
+                parts=parts,
+                full_digest=whole,
+            )
+        if verify:
+            return verify_object(
+                s3_client,
+                bucket_name,
+                obj_name,
+                body,
+                verify,
+                part_size,
+                parts=hashing.result(),
+            )
+
+
+def upload_objects(
+    s3_client,
+    bucket_name,
+    obj_paths,
+    compress=None,
+    max_workers=4,
+    verify=None,
+    report_path=None,
+):
     if not bucket_exists(s3_client, bucket_name):
         log.error(f"❌ Bucket {bucket_name} does not exist.")
         return False
+    if compress and compress not in CODECS:
+        log.error(f"❌ Compression '{compress}' is not available.")
+        return False
+    if verify and verify not in ALGORITHMS:
+        log.error(f"❌ Checksum algorithm '{verify}' is not available.")
+        return False
 
-    uploaded = 0
-    try:
-        for obj_path in obj_paths:
-            if not os.path.exists(obj_path):
-                log.warning(f"⚠️ File {obj_path} not found. Skipping.")
-                continue
-            obj_name = os.path.basename(obj_path)
-            log.info(f"⬆️ Uploading {obj_name} to bucket {bucket_name}...")
-            s3_client.upload_file(obj_path, bucket_name, obj_name)
-            uploaded += 1
-            log.info(f"✅ Uploaded {obj_name}")
+    paths = []
+    for obj_path in obj_paths:
+        if not os.path.exists(obj_path):
+            log.warning(f"⚠️ File {obj_path} not found. Skipping.")
+            continue
+        paths.append(obj_path)
 
-        if uploaded == 0:
-            log.info("⚠️ No files uploaded.")
+    # Each worker uploads its own file, compressing it on the fly when asked.
+    # max_workers is the thread budget for the whole call, split between
+    # files and their parts.
+    file_workers = max(1, min(max_workers, len(paths)))
+    config = _transfer_config(max_workers // file_workers)
+    uploaded, failed, report = 0, False, []
+    results = run_concurrently(
+        lambda path: _upload_one(
+            s3_client, bucket_name, path, compress, verify, config
+        ),
+        paths,
+        file_workers,
+    )
+    for _, row, error in results:
+        if error:
+            failed = True
+            log.error(f"❌ Upload error: {str(error)}")
         else:
-            log.info("✅ Upload(s) completed.")
-        return True
-    except (ClientError, BotoCoreError) as e:
-        log.error(f"❌ Upload error: {str(e)}")
+            uploaded += 1
+            if row:
+                report.append(row)
+
+    log_report(report, report_path)
+    if failed or any(r["Status"] == "MISMATCH" for r in report):
         return False
+    if uploaded == 0:
+        log.info("⚠️ No files uploaded.")
+    else:
+        log.info("✅ Upload(s) completed.")
+    return True
 
 
 def list_objects(s3_client, bucket_name, return_list=False):
@@ -170,22 +419,127 @@ def list_objects(s3_client, bucket_name, return_list=False):
         return [] if return_list else None
 
 
-def download_objects(s3_client, bucket_name, obj_names, dest_dir):
+def _download_decompressed(s3_client, bucket_name, obj_name, codec, dest_path):
+    decompressor = CODECS[codec][1]()
+    body = s3_client.get_object(Bucket=bucket_name, Key=obj_name)["Body"]
+    with open(dest_path, "wb") as dest:
+        for chunk in body.iter_chunks(CHUNK_SIZE):
+            dest.write(decompressor.decompress(chunk))
+        if hasattr(decompressor, "flush"):
+            dest.write(decompressor.flush())
+
+
+def _download_part(s3_client, bucket_name, obj_name, etag, dest_path, start, end, algo):
+    # Fetch bytes start..end into place in dest_path, hashing them as they
+    # are written. IfMatch keeps every range on the same object version.
+    hasher = HASHERS[algo]()
+    body = s3_client.get_object(
+        Bucket=bucket_name, Key=obj_name, Range=f"bytes={start}-{end}", IfMatch=etag
+    )["Body"]
+    with open(dest_path, "r+b") as dest:
+        dest.seek(start)
+        for chunk in body.iter_chunks(CHUNK_SIZE):
+            dest.write(chunk)
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+def _download_verified(s3_client, bucket_name, obj_name, head, dest_path, algo, config):
+    # Download in ranges that line up with the object's upload parts, so the
+    # part digests behind its ETag or composite checksum are computed while
+    # the data arrives rather than in a second pass over the file.
+    size = head["ContentLength"]
+    part_size = first_part_size(s3_client, bucket_name, obj_name, PART_SIZE) or 1
+    with open(dest_path, "wb") as dest:
+        dest.truncate(size)
+    ranges = [(s, min(s + part_size, size) - 1) for s in range(0, size, part_size)]
+    digests = {}
+    results = run_concurrently(
+        lambda r: _download_part(
+            s3_client, bucket_name, obj_name, head["ETag"], dest_path, *r, algo
+        ),
+        ranges,
+        config.max_concurrency,
+    )
+    for (start, _), digest, error in results:
+        if error:
+            raise error
+        digests[start] = digest
+    parts = [digests[start] for start, _ in ranges] or [HASHERS[algo]().digest()]
+    with open(dest_path, "rb") as file:
+        return verify_object(
+            s3_client, bucket_name, obj_name, file, algo, part_size, parts=parts
+        )
+
+
+def download_objects(
+    s3_client,
+    bucket_name,
+    obj_names,
+    dest_dir,
+    verify=None,
+    report_path=None,
+    max_workers=None,
+):
     if not bucket_exists(s3_client, bucket_name):
         log.error(f"❌ Bucket {bucket_name} does not exist.")
         return False
+    if verify and verify not in ALGORITHMS:
+        log.error(f"❌ Checksum algorithm '{verify}' is not available.")
+        return False
 
-    downloaded = 0
+    config = _transfer_config(max_workers) if max_workers else TRANSFER_CONFIG
+    downloaded, report = 0, []
     try:
         for obj_name in obj_names:
-            if not object_exists(s3_client, bucket_name, obj_name):
+            try:
+                head = s3_client.head_object(Bucket=bucket_name, Key=obj_name)
+            except ClientError:
                 log.warning(f"⚠️ Object {obj_name} does not exist. Skipping.")
                 continue
             dest_path = os.path.join(dest_dir, obj_name)
             log.info(f"⬇️  Downloading {obj_name} to {dest_path}")
-            s3_client.download_file(bucket_name, obj_name, dest_path)
+            # Drop transfer-only tokens such as "aws-chunked"
+            encodings = head.get("ContentEncoding", "").split(",")
+            encoding = next(
+                (e.strip() for e in encodings if e.strip() != "aws-chunked"), None
+            )
+            if encoding in CODECS:
+                _download_decompressed(
+                    s3_client, bucket_name, obj_name, encoding, dest_path
+                )
+                if verify:
+                    # The stored checksum covers the encoded bytes, not these
+                    report.append(
+                        {"Object": obj_name, "Algorithm": verify, "Status": "SKIPPED"}
+                    )
+            else:
+                if encoding in ("gzip", "zstd"):
+                    log.warning(
+                        f"⚠️ {obj_name} is {encoding}-encoded but {encoding} "
+                        "is not available. Saving it compressed."
+                    )
+                if verify:
+                    report.append(
+                        _download_verified(
+                            s3_client,
+                            bucket_name,
+                            obj_name,
+                            head,
+                            dest_path,
+                            verify,
+                            config,
+                        )
+                    )
+                else:
+                    s3_client.download_file(
+                        bucket_name, obj_name, dest_path, Config=config
+                    )
             downloaded += 1
 
+        log_report(report, report_path)
+        if any(r["Status"] == "MISMATCH" for r in report):
+            return False
         if downloaded == 0:
             log.info("⚠️ No objects downloaded.")
         else:
@@ -221,6 +575,27 @@ def delete_objects(s3_client, bucket_name, obj_keys):
         return False
 
 
+def empty_bucket(s3_client, bucket_name):
+    # Remove every object version, delete marker and in-progress multipart
+    # upload, using batched DeleteObjects. Returns the number of versions removed.
+    uploads = s3_client.get_paginator("list_multipart_uploads")
+    for page in uploads.paginate(Bucket=bucket_name):
+        for upload in page.get("Uploads", []):
+            s3_client.abort_multipart_upload(
+                Bucket=bucket_name, Key=upload["Key"], UploadId=upload["UploadId"]
+            )
+
+    deleted, errors = delete_keys_batched(
+        s3_client, bucket_name, iter_object_versions(s3_client, bucket_name)
+    )
+    if errors:
+        raise RuntimeError(
+            f"{len(errors)} object(s) could not be deleted, "
+            f"e.g. {errors[0]['Key']}: {errors[0]['Message']}"
+        )
+    return deleted
+
+
 def delete_bucket(s3_client, bucket_name):
     if not bucket_exists(s3_client, bucket_name):
         log.error(f"❌ Bucket {bucket_name} does not exist.")
@@ -228,14 +603,573 @@ def delete_bucket(s3_client, bucket_name):
 
     try:
         log.info(f"🧹 Emptying bucket: {bucket_name}...")
-        contents = list_objects(s3_client, bucket_name, return_list=True)
-        for obj in contents:
-            s3_client.delete_object(Bucket=bucket_name, Key=obj)
+        empty_bucket(s3_client, bucket_name)
 
         log.info(f"🗑️ Deleting bucket: {bucket_name}...")
         s3_client.delete_bucket(Bucket=bucket_name)
         log.info("✅ Bucket deleted successfully.")
         return True
-    except (ClientError, BotoCoreError) as e:
+    except (ClientError, BotoCoreError, RuntimeError) as e:
         log.error(f"❌ Error deleting bucket: {str(e)}")
         return False
+
+
+def delete_buckets(s3_client, bucket_names, max_workers=10):
+    # Empty and delete many buckets concurrently, reporting progress as each
+    # bucket finishes. Returns True only if every bucket was deleted.
+    def teardown(bucket_name):
+        removed = empty_bucket(s3_client, bucket_name)
+        s3_client.delete_bucket(Bucket=bucket_name)
+        return removed
+
+    started = time.monotonic()
+    done, failed, removed = 0, 0, 0
+    total = len(bucket_names)
+    log.info(f"🧹 Tearing down {total} bucket(s) with {max_workers} worker(s)...")
+    for bucket_name, count, error in run_concurrently(
+        teardown, bucket_names, max_workers
+    ):
+        done += 1
+        if error:
+            failed += 1
+            log.error(f"❌ [{done}/{total}] {bucket_name}: {str(error)}")
+            continue
+        removed += count
+        log.info(f"🗑️ [{done}/{total}] {bucket_name} deleted ({count} object(s))")
+
+    elapsed = max(time.monotonic() - started, 1e-6)
+    log.info(
+        f"✅ Deleted {total - failed}/{total} bucket(s), {removed} object(s) "
+        f"in {elapsed:.1f}s ({removed / elapsed:.0f} objects/s)."
+    )
+    return failed == 0
+
+
+def iter_objects(s3_client, bucket_name, prefix=""):
+    # Stream every object under a prefix, one listing page at a time.
+    paginator = s3_client.get_paginator("list_objects_v2")
+    pages = paginator.paginate(
+        Bucket=bucket_name,
+        Prefix=prefix,
+        PaginationConfig={"PageSize": LIST_PAGE_SIZE},
+    )
+    for page in pages:
+        for obj in page.get("Contents", []):
+            yield obj
+
+
+def iter_object_versions(s3_client, bucket_name, prefix=""):
+    # Stream {"Key", "VersionId"} for every version and delete marker.
+    paginator = s3_client.get_paginator("list_object_versions")
+    pages = paginator.paginate(
+        Bucket=bucket_name,
+        Prefix=prefix,
+        PaginationConfig={"PageSize": LIST_PAGE_SIZE},
+    )
+    for page in pages:
+        for version in page.get("Versions", []) + page.get("DeleteMarkers", []):
+            yield {"Key": version["Key"], "VersionId": version["VersionId"]}
+
+
+def delete_keys_batched(s3_client, bucket_name, keys):
+    # Delete keys (or {"Key", "VersionId"} dicts) with DeleteObjects, up to
+    # DELETE_BATCH_SIZE per request. Returns (deleted_count, errors).
+    deleted, errors, batch = 0, [], []
+
+    def flush():
+        nonlocal deleted
+        response = s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={
+                "Objects": [{"Key": k} if isinstance(k, str) else k for k in batch],
+                "Quiet": True,
+            },
+        )
+        batch_errors = response.get("Errors", [])
+        errors.extend(batch_errors)
+        deleted += len(batch) - len(batch_errors)
+        batch.clear()
+
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= DELETE_BATCH_SIZE:
+            flush()
+    if batch:
+        flush()
+    return deleted, errors
+
+
+def copy_object(
+    s3_client,
+    src_bucket,
+    src_key,
+    dest_bucket,
+    dest_key,
+    size=None,
+    multipart_threshold=MULTIPART_COPY_THRESHOLD,
+    part_size=COPY_PART_SIZE,
+    storage_class=None,
+):
+    # Server-side copy of one object; bytes never leave S3.
+    source = {"Bucket": src_bucket, "Key": src_key}
+    extra_args = {"StorageClass": storage_class} if storage_class else {}
+    if size is None:
+        size = s3_client.head_object(**source)["ContentLength"]
+
+    if size <= multipart_threshold:
+        s3_client.copy_object(
+            CopySource=source, Bucket=dest_bucket, Key=dest_key, **extra_args
+        )
+        return
+
+    # Carry content headers and user metadata over, as CopyObject would
+    head = s3_client.head_object(**source)
+    for header in COPIED_HEADERS:
+        if head.get(header):
+            extra_args[header] = head[header]
+    # CopyObject keeps the source tags by default; multipart copies must
+    # set them explicitly or the new object comes out untagged
+    tags = s3_client.get_object_tagging(**source)["TagSet"]
+    if tags:
+        extra_args["Tagging"] = urlencode({t["Key"]: t["Value"] for t in tags})
+    upload_id = s3_client.create_multipart_upload(
+        Bucket=dest_bucket,
+        Key=dest_key,
+        ContentType=head.get("ContentType", "binary/octet-stream"),
+        Metadata=head.get("Metadata", {}),
+        **extra_args,
+    )["UploadId"]
+    try:
+        parts = []
+        for number, start in enumerate(range(0, size, part_size), start=1):
+            end = min(start + part_size, size) - 1
+            response = s3_client.upload_part_copy(
+                Bucket=dest_bucket,
+                Key=dest_key,
+                UploadId=upload_id,
+                PartNumber=number,
+                CopySource=source,
+                CopySourceRange=f"bytes={start}-{end}",
+            )
+            parts.append(
+                {"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]}
+            )
+        s3_client.complete_multipart_upload(
+            Bucket=dest_bucket,
+            Key=dest_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except (ClientError, BotoCoreError):
+        s3_client.abort_multipart_upload(
+            Bucket=dest_bucket, Key=dest_key, UploadId=upload_id
+        )
+        raise
+
+
+def copy_objects(
+    s3_client,
+    src_bucket,
+    dest_bucket,
+    prefix="",
+    dest_prefix="",
+    max_workers=10,
+    delete_source=False,
+):
+    # Copy (or move) every object under prefix to dest_bucket/dest_prefix,
+    # streaming the listing and copying keys concurrently.
+    if src_bucket == dest_bucket and (
+        dest_prefix.startswith(prefix) or prefix.startswith(dest_prefix)
+    ):
+        # Copies would land back in the listing being copied
+        log.error("❌ Source and destination prefixes overlap in the same bucket.")
+        return False
+    for bucket_name in {src_bucket, dest_bucket}:
+        if not bucket_exists(s3_client, bucket_name):
+            log.error(f"❌ Bucket {bucket_name} does not exist.")
+            return False
+
+    def copy_one(obj):
+        dest_key = dest_prefix + obj["Key"][len(prefix) :]
+        copy_object(
+            s3_client, src_bucket, obj["Key"], dest_bucket, dest_key, obj["Size"]
+        )
+
+    action = "Moving" if delete_source else "Copying"
+    log.info(
+        f"📑 {action} s3://{src_bucket}/{prefix} to s3://{dest_bucket}/{dest_prefix}..."
+    )
+    copied, failed, pending_delete = 0, 0, []
+
+    def delete_copied():
+        # Sources of a move are deleted a batch at a time as copies complete
+        nonlocal failed
+        _, errors = delete_keys_batched(s3_client, src_bucket, pending_delete)
+        for err in errors:
+            log.error(f"❌ Failed to delete {err['Key']}: {err['Message']}")
+        failed += len(errors)
+        pending_delete.clear()
+
+    try:
+        results = run_concurrently(
+            copy_one, iter_objects(s3_client, src_bucket, prefix), max_workers
+        )
+        for obj, _, error in results:
+            if error:
+                failed += 1
+                log.error(f"❌ Failed to copy {obj['Key']}: {str(error)}")
+                continue
+            copied += 1
+            if delete_source:
+                pending_delete.append(obj["Key"])
+                if len(pending_delete) >= DELETE_BATCH_SIZE:
+                    delete_copied()
+        if pending_delete:
+            delete_copied()
+    except (ClientError, BotoCoreError) as e:
+        log.error(f"❌ Copy error: {str(e)}")
+        return False
+
+    if not copied and not failed:
+        log.info("⚠️ No objects copied.")
+    else:
+        log.info(f"✅ {copied} object(s) copied, {failed} failure(s).")
+    return failed == 0
+
+
+def move_objects(
+    s3_client, src_bucket, dest_bucket, prefix="", dest_prefix="", max_workers=10
+):
+    return copy_objects(
+        s3_client,
+        src_bucket,
+        dest_bucket,
+        prefix,
+        dest_prefix,
+        max_workers,
+        delete_source=True,
+    )
+
+
+def _human_size(num_bytes):
+    for unit in ["B", "KB", "MB", "GB", "TB"]:
+        if num_bytes < 1024 or unit == "TB":
+            return f"{num_bytes:.1f} {unit}" if unit != "B" else f"{num_bytes} B"
+        num_bytes /= 1024
+
+
+def _prefix_at_depth(key, depth):
+    # "a/b/c.txt" -> "a/" at depth 1, "a/b/" at depth 2; top-level keys -> ""
+    dirs = key.split("/")[:-1][:depth]
+    return "".join(d + "/" for d in dirs)
+
+
+def _age_label(last_modified, now):
+    age_days = (now - last_modified).days
+    for limit, label in AGE_BUCKETS:
+        if limit is None or age_days < limit:
+            return label
+
+
+def summarize_bucket(s3_client, bucket_name, depth=1, now=None):
+    # Aggregate a streamed listing into per-prefix stats. Memory grows with
+    # the number of distinct prefixes, not the number of objects.
+    now = now or datetime.now(timezone.utc)
+    usage = {}
+    for obj in iter_objects(s3_client, bucket_name):
+        prefix = _prefix_at_depth(obj["Key"], depth)
+        stats = usage.setdefault(
+            prefix, {"Objects": 0, "Size": 0, "StorageClasses": {}, "Ages": {}}
+        )
+        stats["Objects"] += 1
+        stats["Size"] += obj["Size"]
+        storage_class = obj.get("StorageClass", "STANDARD")
+        classes = stats["StorageClasses"]
+        classes[storage_class] = classes.get(storage_class, 0) + obj["Size"]
+        age = _age_label(obj["LastModified"], now)
+        stats["Ages"][age] = stats["Ages"].get(age, 0) + 1
+    return usage
+
+
+def bucket_usage(
+    s3_client, bucket_names, depth=1, top=10, max_workers=4, return_list=False
+):
+    # Summarize several buckets in parallel and report the heaviest prefixes.
+    rows = []
+    results = run_concurrently(
+        lambda name: summarize_bucket(s3_client, name, depth),
+        bucket_names,
+        max_workers,
+    )
+    for bucket_name, usage, error in results:
+        if error:
+            log.error(f"❌ Failed to summarize bucket '{bucket_name}': {str(error)}")
+            continue
+        for prefix, stats in usage.items():
+            rows.append({"Bucket Name": bucket_name, "Prefix": prefix or "/", **stats})
+
+    rows.sort(key=lambda r: r["Size"], reverse=True)
+    rows = rows[:top]
+    if return_list:
+        return rows
+
+    if not rows:
+        log.info("No objects found.")
+        return None
+    log.info(
+        f"Top {len(rows)} prefixes by size:\n"
+        + tabulate(
+            [
+                [
+                    r["Bucket Name"],
+                    r["Prefix"],
+                    r["Objects"],
+                    _human_size(r["Size"]),
+                    ", ".join(
+                        f"{c}: {_human_size(b)}"
+                        for c, b in sorted(r["StorageClasses"].items())
+                    ),
+                    ", ".join(
+                        f"{label}: {r['Ages'][label]}"
+                        for _, label in AGE_BUCKETS
+                        if label in r["Ages"]
+                    ),
+                ]
+                for r in rows
+            ],
+            headers=["Bucket Name", "Prefix", "Objects", "Size", "Storage", "Age"],
+            tablefmt="fancy_grid",
+        )
+    )
+
+
+def _batches(items, size):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_matching_objects(
+    s3_client,
+    bucket_name,
+    prefix="",
+    older_than_days=None,
+    larger_than=None,
+    smaller_than=None,
+    storage_classes=None,
+    now=None,
+):
+    # Stream objects matching every given filter, in a single listing pass.
+    # Size bounds are strict, like ObjectSizeGreaterThan/LessThan in lifecycle rules.
+    now = now or datetime.now(timezone.utc)
+    for obj in iter_objects(s3_client, bucket_name, prefix):
+        if older_than_days is not None:
+            if (now - obj["LastModified"]).days < older_than_days:
+                continue
+        if larger_than is not None and obj["Size"] <= larger_than:
+            continue
+        if smaller_than is not None and obj["Size"] >= smaller_than:
+            continue
+        if (
+            storage_classes
+            and obj.get("StorageClass", "STANDARD") not in storage_classes
+        ):
+            continue
+        yield obj
+
+
+def expire_objects(
+    s3_client,
+    bucket_name,
+    prefix="",
+    older_than_days=None,
+    larger_than=None,
+    smaller_than=None,
+    storage_classes=None,
+    transition_to=None,
+    dry_run=False,
+    max_workers=10,
+):
+    # Delete (or move to transition_to) every matching object. Deletes go out
+    # as concurrent DeleteObjects batches, transitions as concurrent in-place
+    # copies. dry_run only reports what would happen.
+    if not bucket_exists(s3_client, bucket_name):
+        log.error(f"❌ Bucket {bucket_name} does not exist.")
+        return False
+
+    if transition_to:
+        # An in-place copy writes a new version; on a versioned bucket the
+        # old one stays behind as a noncurrent version, still billed at its
+        # original storage class
+        try:
+            versioning = s3_client.get_bucket_versioning(Bucket=bucket_name)
+        except (ClientError, BotoCoreError) as e:
+            log.error(f"❌ Expire error: {str(e)}")
+            return False
+        if versioning.get("Status") in ("Enabled", "Suspended"):
+            message = (
+                f"Bucket {bucket_name} is versioned: --transition-to would keep "
+                "every old version as noncurrent. Use --lifecycle instead."
+            )
+            if not dry_run:
+                log.error(f"❌ {message}")
+                return False
+            log.warning(f"⚠️ {message}")
+
+    matched, matched_bytes, by_class, sample = 0, 0, {}, []
+
+    def tally(objects):
+        nonlocal matched, matched_bytes
+        for obj in objects:
+            matched += 1
+            matched_bytes += obj["Size"]
+            storage_class = obj.get("StorageClass", "STANDARD")
+            by_class[storage_class] = by_class.get(storage_class, 0) + 1
+            if len(sample) < 10:
+                sample.append(obj["Key"])
+            yield obj
+
+    objects = iter_matching_objects(
+        s3_client,
+        bucket_name,
+        prefix,
+        older_than_days,
+        larger_than,
+        smaller_than,
+        storage_classes,
+    )
+    if transition_to:
+        # Objects already tiered, or archived and unreadable until restored,
+        # are left alone so repeated runs stay clean
+        skip = {transition_to, *ARCHIVE_STORAGE_CLASSES}
+        objects = (o for o in objects if o.get("StorageClass", "STANDARD") not in skip)
+    objects = tally(objects)
+    action = f"transition to {transition_to}" if transition_to else "deletion"
+    processed, failed = 0, 0
+    try:
+        if dry_run:
+            for _ in objects:
+                pass
+        elif transition_to:
+
+            def transition(obj):
+                copy_object(
+                    s3_client,
+                    bucket_name,
+                    obj["Key"],
+                    bucket_name,
+                    obj["Key"],
+                    obj["Size"],
+                    storage_class=transition_to,
+                )
+
+            for obj, _, error in run_concurrently(transition, objects, max_workers):
+                if error:
+                    failed += 1
+                    log.error(f"❌ Failed to transition {obj['Key']}: {str(error)}")
+                else:
+                    processed += 1
+        else:
+            keys = (obj["Key"] for obj in objects)
+            results = run_concurrently(
+                lambda batch: delete_keys_batched(s3_client, bucket_name, batch),
+                _batches(keys, DELETE_BATCH_SIZE),
+                max_workers,
+            )
+            for batch, result, error in results:
+                if error:
+                    failed += len(batch)
+                    log.error(f"❌ Batch delete failed: {str(error)}")
+                    continue
+                deleted, errors = result
+                processed += deleted
+                failed += len(errors)
+                for err in errors:
+                    log.error(f"❌ Failed to delete {err['Key']}: {err['Message']}")
+    except (ClientError, BotoCoreError) as e:
+        log.error(f"❌ Expire error: {str(e)}")
+        return False
+
+    summary = tabulate(
+        [[c, n] for c, n in sorted(by_class.items())],
+        headers=["Storage Class", "Objects"],
+        tablefmt="fancy_grid",
+    )
+    if dry_run:
+        log.info(
+            f"🔎 Dry run: {matched} object(s), {_human_size(matched_bytes)} in "
+            f"'{bucket_name}' would be marked for {action}.\n{summary}"
+            + (f"\nSample: {', '.join(sample)}" if sample else "")
+        )
+        return True
+    if matched == 0:
+        log.info("⚠️ No objects matched.")
+        return True
+    log.info(
+        f"✅ {processed}/{matched} object(s) ({_human_size(matched_bytes)}) "
+        f"processed for {action}, {failed} failure(s).\n{summary}"
+    )
+    return failed == 0
+
+
+def lifecycle_rule(
+    rule_id,
+    prefix="",
+    older_than_days=None,
+    larger_than=None,
+    smaller_than=None,
+    transition_to=None,
+):
+    # Build the bucket lifecycle rule equivalent to an s3-expire run, so S3
+    # applies it on a schedule with no client-side work. Raises ValueError.
+    if not older_than_days or older_than_days < 1:
+        raise ValueError("Lifecycle rules need an age of at least 1 day")
+
+    conditions = {"Prefix": prefix} if prefix else {}
+    if larger_than is not None:
+        conditions["ObjectSizeGreaterThan"] = larger_than
+    if smaller_than is not None:
+        conditions["ObjectSizeLessThan"] = smaller_than
+    if len(conditions) > 1:
+        rule_filter = {"And": conditions}
+    elif "Prefix" in conditions or not conditions:
+        rule_filter = {"Prefix": prefix}
+    else:
+        rule_filter = conditions
+
+    rule = {"ID": rule_id, "Filter": rule_filter, "Status": "Enabled"}
+    if transition_to:
+        rule["Transitions"] = [{"Days": older_than_days, "StorageClass": transition_to}]
+    else:
+        rule["Expiration"] = {"Days": older_than_days}
+    return rule
+
+
+def apply_lifecycle_rule(s3_client, bucket_name, rule, dry_run=False):
+    # Add the rule to the bucket's lifecycle configuration, replacing any
+    # existing rule with the same ID.
+    log.info(f"📜 Lifecycle rule for '{bucket_name}':\n{json.dumps(rule, indent=2)}")
+    if dry_run:
+        return True
+    try:
+        try:
+            response = s3_client.get_bucket_lifecycle_configuration(Bucket=bucket_name)
+            rules = response.get("Rules", [])
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchLifecycleConfiguration":
+                raise
+            rules = []
+        rules = [r for r in rules if r.get("ID") != rule["ID"]] + [rule]
+        s3_client.put_bucket_lifecycle_configuration(
+            Bucket=bucket_name, LifecycleConfiguration={"Rules": rules}
+        )
+        log.info(f"✅ Lifecycle rule '{rule['ID']}' applied to {bucket_name}.")
+        return True
+    except (ClientError, BotoCoreError) as e:
+        log.error(f"❌ Failed to apply lifecycle rule: {str(e)}")
+        return False
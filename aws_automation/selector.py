@@ -0,0 +1,260 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import questionary
+from botocore.exceptions import BotoCoreError, ClientError
+
+from aws_automation.utils import logger
+
+log = logger()
+
+PAGE_SIZE = 50
+SEARCH_LIMIT = 100
+# How long to wait for a page before showing the prompt with a loading entry
+PAGE_WAIT = 0.5
+# How long a search waits for the background listing before using partial results
+SEARCH_WAIT = 2.0
+
+
+class PrefixPager:
+    # Lists one "folder" level of a bucket (Delimiter="/") a page at a time.
+    # Pages are fetched on demand and the next one is prefetched in the
+    # background while the current one is on screen.
+
+    def __init__(self, s3_client, bucket_name, prefix, executor, page_size=PAGE_SIZE):
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.prefix = prefix
+        self.page_size = page_size
+        self.pages = []
+        self.done = False
+        self._token = None
+        self._executor = executor
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def _fetch_next(self):
+        kwargs = {
+            "Bucket": self.bucket_name,
+            "Prefix": self.prefix,
+            "Delimiter": "/",
+            "MaxKeys": self.page_size,
+        }
+        if self._token:
+            kwargs["ContinuationToken"] = self._token
+        response = self.s3_client.list_objects_v2(**kwargs)
+        entries = [("dir", p["Prefix"]) for p in response.get("CommonPrefixes", [])]
+        entries += [
+            ("obj", o["Key"])
+            for o in response.get("Contents", [])
+            if o["Key"] != self.prefix
+        ]
+        # page() reads these without the lock, so done must flip last
+        with self._lock:
+            if entries or not self.pages:
+                self.pages.append(entries)
+            self._token = response.get("NextContinuationToken")
+            self.done = not response.get("IsTruncated")
+
+    def prefetch(self):
+        with self._lock:
+            if not self.done and (self._pending is None or self._pending.done()):
+                self._pending = self._executor.submit(self._fetch_next)
+            return self._pending
+
+    def page(self, index, timeout=None):
+        # Wait up to timeout for page `index`. Returns None if it is still
+        # loading, [] if the listing ended before it.
+        while len(self.pages) <= index and not self.done:
+            pending = self._pending
+            if pending is None or pending.done():
+                pending = self.prefetch()
+            try:
+                pending.result(timeout)
+            except TimeoutError:
+                return None
+        if index < len(self.pages):
+            self.prefetch()
+            return self.pages[index]
+        return []
+
+
+class KeyIndex:
+    # Streams every key under a prefix into memory in the background, so
+    # searches can run over whatever has been listed so far.
+
+    def __init__(self, s3_client, bucket_name, prefix, executor):
+        self.keys = []
+        self.done = False
+        self.error = None
+        self.cancelled = False
+        self._future = executor.submit(self._load, s3_client, bucket_name, prefix)
+
+    def _load(self, s3_client, bucket_name, prefix):
+        try:
+            paginator = s3_client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+                if self.cancelled:
+                    return
+                self.keys.extend(o["Key"] for o in page.get("Contents", []))
+        except (ClientError, BotoCoreError) as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def wait(self, timeout=None):
+        self._future.exception(timeout)
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        scored = []
+        for key in list(self.keys):
+            score = fuzzy_score(query, key)
+            if score is not None:
+                scored.append((score, key))
+        scored.sort()
+        return [key for _, key in scored[:limit]]
+
+
+def fuzzy_score(query, key):
+    # Lower is better; None if the query's characters are not all present in
+    # order. Substring hits rank first, then tighter subsequence matches.
+    query, text = query.lower(), key.lower()
+    if not query:
+        return (0, 0, len(key))
+    found = text.find(query)
+    if found >= 0:
+        return (0, found, len(key))
+
+    pos, first = 0, None
+    for char in query:
+        pos = text.find(char, pos)
+        if pos < 0:
+            return None
+        if first is None:
+            first = pos
+        pos += 1
+    return (1, pos - first, len(key))
+
+
+def _search(index, selected):
+    query = questionary.text("🔍 Search keys (fuzzy):").ask()
+    if not query:
+        return
+    try:
+        index.wait(SEARCH_WAIT)
+    except TimeoutError:
+        pass
+    if index.error:
+        log.error(f"❌ Failed to list keys for search: {str(index.error)}")
+        return
+    matches = index.search(query)
+    status = "" if index.done else " (listing still loading, partial results)"
+    if not matches:
+        log.info(f"No keys match '{query}'{status}.")
+        return
+    chosen = questionary.checkbox(
+        f"Matches for '{query}'{status}:",
+        choices=[
+            questionary.Choice(k, value=k, checked=k in selected) for k in matches
+        ],
+    ).ask()
+    if chosen is None:
+        return
+    selected.difference_update(matches)
+    selected.update(chosen)
+
+
+def browse_objects(s3_client, bucket_name, page_size=PAGE_SIZE):
+    # Interactive, lazily loaded object picker with prefix drill-down and
+    # fuzzy search. Returns the selected keys, or [] if cancelled.
+    selected = set()
+    prefix, page_index = "", 0
+    pagers, indexes = {}, {}
+
+    executor = ThreadPoolExecutor(max_workers=4)
+
+    def pager_for(p):
+        if p not in pagers:
+            pagers[p] = PrefixPager(s3_client, bucket_name, p, executor, page_size)
+            pagers[p].prefetch()
+        return pagers[p]
+
+    try:
+        pager = pager_for(prefix)
+        last = None
+        while True:
+            entries = pager.page(page_index, PAGE_WAIT)
+            if entries == [] and not prefix and page_index == 0:
+                log.warning(f"⚠️ No objects in bucket '{bucket_name}'.")
+                return []
+
+            choices = []
+            if entries is None:
+                choices.append(
+                    questionary.Choice("⏳ Loading... (refresh)", ("wait", None))
+                )
+            for kind, name in entries or []:
+                label = name[len(prefix) :]
+                if kind == "dir":
+                    choices.append(questionary.Choice(f"📁 {label}", ("cd", name)))
+                else:
+                    mark = "☑" if name in selected else "☐"
+                    choices.append(
+                        questionary.Choice(f"{mark} {label}", ("toggle", name))
+                    )
+            choices.append(questionary.Separator())
+            if not pager.done or page_index + 1 < len(pager.pages):
+                choices.append(questionary.Choice("▶ Next page", ("next", None)))
+            if page_index > 0:
+                choices.append(questionary.Choice("◀ Previous page", ("prev", None)))
+            if prefix:
+                choices.append(questionary.Choice("⬆ Up one level", ("up", None)))
+            choices += [
+                questionary.Choice("☑ Select all on this page", ("all", None)),
+                questionary.Choice("🔍 Search", ("search", None)),
+                questionary.Choice(
+                    f"✅ Done ({len(selected)} selected)", ("done", None)
+                ),
+                questionary.Choice("❌ Cancel", ("cancel", None)),
+            ]
+
+            # Keep the cursor on the last entry picked, e.g. after a toggle
+            values = [c.value for c in choices if isinstance(c, questionary.Choice)]
+            answer = questionary.select(
+                f"s3://{bucket_name}/{prefix} (page {page_index + 1}):",
+                choices=choices,
+                default=last if last in values else None,
+            ).ask()
+            action, value = answer or ("cancel", None)
+            last = answer
+
+            if action == "wait":
+                pager.page(page_index)
+            elif action == "toggle":
+                selected.symmetric_difference_update([value])
+            elif action == "cd":
+                prefix, page_index = value, 0
+                pager = pager_for(prefix)
+            elif action == "up":
+                prefix = prefix[: prefix[:-1].rfind("/") + 1]
+                page_index = 0
+                pager = pager_for(prefix)
+            elif action == "next":
+                page_index += 1
+            elif action == "prev":
+                page_index -= 1
+            elif action == "all":
+                selected.update(n for kind, n in entries or [] if kind == "obj")
+            elif action == "search":
+                if prefix not in indexes:
+                    indexes[prefix] = KeyIndex(s3_client, bucket_name, prefix, executor)
+                _search(indexes[prefix], selected)
+            elif action == "done":
+                return sorted(selected)
+            else:
+                return []
+    finally:
+        # Don't hold the prompt's exit on background listings
+        for index in indexes.values():
+            index.cancelled = True
+        executor.shutdown(wait=False, cancel_futures=True)
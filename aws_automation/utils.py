@@ -1,26 +1,206 @@
+import copy
 import os
+import re
 import yaml
 import logging
-
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 # ---------- Config Loader ---------- #
-def load_config():
+CONFIG_ENV_VAR = "AWS_AUTOMATION_CONFIG"
+PROFILE_ENV_VAR = "AWS_AUTOMATION_PROFILE"
+
+# Performance settings shared by the transfer, listing and EC2 engines
+TUNING_DEFAULTS = {
+    "max_workers": 10,
+    "max_pool_connections": 50,
+    "max_attempts": 5,
+    "multipart_threshold": 8 * 1024**2,
+    "multipart_chunksize": 8 * 1024**2,
+    "list_page_size": 1000,
+    "ec2_page_size": 1000,
+    "inventory_ttl": 60,
+}
+
+_REGION_RE = re.compile(r"^[a-z]{2}(-gov|-iso[a-z]*)?-[a-z]+-\d+$")
+_INSTANCE_TYPE_RE = re.compile(r"^[a-z][a-z0-9-]*\.[a-z0-9]+$")
+_AMI_RE = re.compile(r"^ami-[0-9a-f]{8,17}$")
+_BUCKET_RE = re.compile(r"^[a-z0-9][a-z0-9.-]{1,61}[a-z0-9]$")
+
+
+def _pattern(regex, what):
+    def check(value):
+        if not isinstance(value, str) or not regex.match(value):
+            raise ValueError(f"{value!r} is not a valid {what}")
+
+    return check
+
+
+def _text(value):
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{value!r} must be a non-empty string")
+
+
+def _int_range(low, high=None):
+    def check(value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{value!r} must be an integer")
+        if value < low or (high is not None and value > high):
+            bounds = f">= {low}" if high is None else f"between {low} and {high}"
+            raise ValueError(f"{value!r} must be {bounds}")
+
+    return check
+
+
+def _required(check):
+    # Marks a field every command needs once profiles and regions are merged
+    def required(value):
+        check(value)
+
+    required.required = True
+    return required
+
+
+# section -> field -> validator
+CONFIG_SCHEMA = {
+    "aws": {
+        "region_name": _required(_pattern(_REGION_RE, "AWS region")),
+        "instance_type": _pattern(_INSTANCE_TYPE_RE, "instance type"),
+        "ami_id": _pattern(_AMI_RE, "AMI ID"),
+        "key_name": _text,
+        "security_group_name": _text,
+        "security_group_description": _text,
+        "instance_name": _text,
+    },
+    "s3": {
+        "bucket_name": _pattern(_BUCKET_RE, "bucket name"),
+        "region_name": _required(_pattern(_REGION_RE, "AWS region")),
+    },
+    "tuning": {
+        "max_workers": _int_range(1, 256),
+        "max_pool_connections": _int_range(1),
+        "max_attempts": _int_range(1, 20),
+        # S3 rejects multipart parts below 5 MB
+        "multipart_threshold": _int_range(5 * 1024**2),
+        "multipart_chunksize": _int_range(5 * 1024**2, 5 * 1024**3),
+        "list_page_size": _int_range(1, 1000),
+        "ec2_page_size": _int_range(5, 1000),
+        "inventory_ttl": _int_range(0),
+    },
+}
+
+# path -> (mtime, parsed YAML)
+_config_cache = {}
+
+
+def _merge(base, override):
+    merged = dict(base)
+    for key, value in (override or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _read_config(config_path):
+    # Parse the file once; re-parse only when its mtime changes
     try:
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        config_path = os.path.join(base_dir, "config.yaml")
-        with open(config_path, "r") as file:
-            config = yaml.safe_load(file)
+        mtime = os.path.getmtime(config_path)
+    except OSError:
+        mtime = None
+    cached = _config_cache.get(config_path)
+    if mtime is not None and cached and cached[0] == mtime:
+        return cached[1]
 
-            # Optional: Validate required keys
-            required_keys = ["aws", "s3"]
-            for key in required_keys:
-                if key not in config:
-                    raise ValueError(f"Missing '{key}' section in config.yaml")
+    with open(config_path, "r") as file:
+        raw = yaml.safe_load(file) or {}
+    if mtime is not None:
+        _config_cache[config_path] = (mtime, raw)
+    return raw
 
-            return config
+
+# Fields only some commands read, required by load_config when they run
+CREATE_FIELDS = (
+    "aws.ami_id",
+    "aws.instance_type",
+    "aws.key_name",
+    "aws.security_group_name",
+    "aws.instance_name",
+)
+
+
+def validate_config(config, required=()):
+    # Validate known fields and types; raises ValueError on the first problem.
+    # required lists extra "section.field" names the caller needs.
+    for key in ["aws", "s3"]:
+        if not isinstance(config.get(key), dict):
+            raise ValueError(f"Missing '{key}' section in config.yaml")
+
+    for section, fields in CONFIG_SCHEMA.items():
+        for field, check in fields.items():
+            if getattr(check, "required", False) and field not in config[section]:
+                raise ValueError(f"Missing required field '{section}.{field}'")
+        for field, value in config.get(section, {}).items():
+            if field not in fields:
+                logger().warning(f"⚠️ Unknown config field '{section}.{field}'")
+                continue
+            try:
+                fields[field](value)
+            except ValueError as e:
+                raise ValueError(f"{section}.{field}: {e}") from None
+    for name in required:
+        section, field = name.split(".")
+        if field not in config[section]:
+            raise ValueError(f"Missing required field '{name}'")
+
+    tuning = config["tuning"]
+    if tuning["multipart_threshold"] < tuning["multipart_chunksize"]:
+        raise ValueError("tuning.multipart_threshold must be >= multipart_chunksize")
+
+
+def resolve_config(raw, profile=None, region=None):
+    # Layer the base sections, the selected profile and per-region overrides:
+    #   profiles: {dev: {aws: {...}, s3: {...}}}
+    #   regions:  {eu-west-1: {aws: {ami_id: ...}}}
+    raw = copy.deepcopy(raw)  # keep the cached parse pristine
+    profiles = raw.get("profiles") or {}
+    profile = profile or os.environ.get(PROFILE_ENV_VAR) or raw.get("default_profile")
+    if profile and profile not in profiles:
+        raise ValueError(f"Unknown profile '{profile}'")
+
+    base = {k: v for k, v in raw.items() if k not in ("profiles", "default_profile")}
+    config = _merge(base, profiles.get(profile))
+    regions = config.pop("regions", None) or {}
+    if region:
+        for section in ("aws", "s3"):
+            config[section] = _merge(config.get(section), {"region_name": region})
+
+    # Region overrides apply to each section according to its own region
+    for section in ("aws", "s3"):
+        section_region = (config.get(section) or {}).get("region_name")
+        overrides = (regions.get(section_region) or {}).get(section)
+        if overrides:
+            config[section] = _merge(config[section], overrides)
+
+    config["tuning"] = _merge(TUNING_DEFAULTS, config.get("tuning"))
+    config["profile"] = profile
+    return config
+
+
+def load_config(config_path=None, profile=None, region=None, required=()):
+    try:
+        if not config_path:
+            config_path = os.environ.get(CONFIG_ENV_VAR)
+        if not config_path:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            config_path = os.path.join(base_dir, "config.yaml")
+
+        config = resolve_config(_read_config(config_path), profile, region)
+        validate_config(config, required)
+        return config
 
     except FileNotFoundError:
-        logger().error("❌ config.yaml not found.")
+        logger().error(f"❌ Config file {config_path} not found.")
         exit(1)
     except yaml.YAMLError as e:
         logger().error(f"❌ YAML parsing error: {e}")
@@ -35,3 +215,30 @@ def logger(name="aws_tool"):
     log_format = "%(asctime)s - %(levelname)s - %(message)s"
     logging.basicConfig(level=logging.INFO, format=log_format)
     return logging.getLogger(name)
+
+
+# ---------- Concurrency ---------- #
+def run_concurrently(func, items, max_workers=10):
+    # Apply func to each item on a thread pool, yielding (item, result, error)
+    # as tasks finish. Items are pulled lazily so a streamed listing is never
+    # materialised: at most 2 * max_workers tasks are in flight at once.
+    max_in_flight = max(1, max_workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        pending = {}
+        for item in items:
+            pending[executor.submit(func, item)] = item
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _collect(future, pending.pop(future))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield _collect(future, pending.pop(future))
+
+
+def _collect(future, item):
+    try:
+        return item, future.result(), None
+    except Exception as e:
+        return item, None, e
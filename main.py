@@ -1,7 +1,9 @@
 import boto3
 import argparse
-from botocore.exceptions import BotoCoreError, ClientError
+from botocore.config import Config
+from aws_automation import ec2, s3
 from aws_automation.ec2 import (
+    create_instance,
     start_instance,
     stop_instance,
     terminate_instance,
@@ -14,59 +16,58 @@ from aws_automation.s3 import (
     delete_objects,
     download_objects,
     delete_bucket,
+    delete_buckets,
     list_buckets,
     prompt_select_objects,
     prompt_select_buckets,
+    copy_objects,
+    move_objects,
+    bucket_usage,
+    expire_objects,
+    lifecycle_rule,
+    apply_lifecycle_rule,
 )
-from aws_automation.utils import load_config, logger
+from aws_automation.inventory import account_key, default_cache_path, list_cached_instances, show_inventory_diff
+from aws_automation.query import query_object
+from aws_automation.remote import DEFAULT_TIMEOUT, DEFAULT_USER, default_key_path, run_on_instances
+from aws_automation.runner import load_plan, run_plan, show_plan
+from aws_automation.utils import CREATE_FIELDS, load_config, logger
 
 log = logger()
 
-def create_instance(ec2_resource, config):
-    try:
-        log.info("Launching EC2 instance...")
-        instance = ec2_resource.create_instances(
-            ImageId=config['aws']['ami_id'],
-            InstanceType=config['aws']['instance_type'],
-            KeyName=config['aws']['key_name'],
-            SecurityGroups=[config['aws']['security_group_name']],
-            MinCount=1,
-            MaxCount=1,
-            TagSpecifications=[{
-                'ResourceType': 'instance',
-                'Tags': [{'Key': 'Name', 'Value': config['aws']['instance_name']}]
-            }]
-        )[0]
-
-        log.info("Waiting for instance to run...")
-        instance.wait_until_running()
-        instance.load()
-
-        log.info("✅ Instance created successfully!")
-        log.info(f"Instance ID: {instance.id}")
-        log.info(f"Public IP Address: {instance.public_ip_address}")
-        log.info(f"State: {instance.state['Name']}")
-
-        return instance
-
-    except ClientError as e:
-        log.error(f"❌ AWS Client Error: {e.response['Error']['Message']}")
-        exit(1)
-    except BotoCoreError as e:
-        log.error(f"❌ Boto3 Core Error: {str(e)}")
-        exit(1)
+# Commands that fall back to s3.bucket_name when no bucket is given
+CONFIG_BUCKET_COMMANDS = (
+    's3-create', 's3-obj-upload', 's3-obj-list', 's3-obj-download', 's3-obj-delete',
+    's3-delete', 's3-copy', 's3-move', 's3-du', 's3-query', 's3-expire',
+)
 
-def main():
-    config = load_config()
 
-    s3_client = boto3.client('s3', region_name=config['s3']['region_name'])
-    ec2_client = boto3.client('ec2', region_name=config['aws']['region_name'])
-    ec2_resource = boto3.resource('ec2', region_name=config['aws']['region_name'])
+def required_fields(args):
+    # Config fields this command will read, beyond the regions every command needs
+    if args.command == 'create':
+        return CREATE_FIELDS
+    if args.command == 'exec' and not args.key_path:
+        return ('aws.key_name',)
+    explicit = (
+        getattr(args, 'bucket', None)
+        or getattr(args, 'src_bucket', None)
+        or getattr(args, 'bucket_names', None)
+        or getattr(args, 'all_buckets', False)
+        or getattr(args, 'interactive', False) and args.command == 's3-delete'
+    )
+    if args.command in CONFIG_BUCKET_COMMANDS and not explicit:
+        return ('s3.bucket_name',)
+    return ()
 
+
+def main():
     parser = argparse.ArgumentParser(
         description="AWS Automation CLI Tool - Manage EC2 and S3 resources easily.",
-        epilog="Example: python main.py s3 list-buckets --region us-east-1"
+        epilog="Example: python main.py --profile dev s3-bucket-list"
     )
+    parser.add_argument('--config', help='Path to config.yaml (or set AWS_AUTOMATION_CONFIG)')
+    parser.add_argument('--profile', help='Named profile from config.yaml (or set AWS_AUTOMATION_PROFILE)')
+    parser.add_argument('--region', help='Override the EC2 and S3 region')
     subparsers = parser.add_subparsers(dest='command', help='Sub-command help')
 
     # EC2 commands
@@ -81,13 +82,30 @@ def main():
     parser_terminate = subparsers.add_parser('terminate', help='Terminate an EC2 instance')
     parser_terminate.add_argument('--instance-id', required=True)
 
-    subparsers.add_parser('list', help='List all running EC2 instances')
+    parser_list = subparsers.add_parser('list', help='List all running EC2 instances')
+    parser_list.add_argument('--cached', action='store_true', help='Answer from the local inventory cache (refreshed incrementally when older than tuning.inventory_ttl)')
+    parser_list.add_argument('--diff', action='store_true', help='Refresh the inventory cache and show instances added, removed or changed')
+    parser_list.add_argument('--full-refresh', action='store_true', help='With --diff, re-describe every instance instead of only changed ones')
+
+    parser_exec = subparsers.add_parser('exec', help='Run a shell command over SSH on running EC2 instances in parallel')
+    parser_exec.add_argument('--command', required=True, dest='remote_command', help='Command to run on each instance')
+    parser_exec.add_argument('--instance-ids', nargs='+', help='Only these instances (default: every running instance)')
+    parser_exec.add_argument('--user', default=DEFAULT_USER, help='SSH login user')
+    parser_exec.add_argument('--key-path', help='Private key file (default: ~/.ssh/<key_name>.pem)')
+    parser_exec.add_argument('--private-ip', action='store_true', help='Connect to private IPs instead of public ones')
+    parser_exec.add_argument('--timeout', type=int, default=DEFAULT_TIMEOUT, help='Seconds allowed per host')
+    parser_exec.add_argument('--workers', type=int, help='Number of hosts to run on at once')
+    parser_exec.add_argument('--cached', action='store_true', help='Take instances from the local inventory cache')
 
     # S3 commands
     subparsers.add_parser('s3-create', help='Create an S3 bucket')
 
     parser_upload = subparsers.add_parser('s3-obj-upload', help='Upload one or more objects to S3')
     parser_upload.add_argument('--obj-paths', nargs='+', required=True, help='Path(s) to the object(s) to upload')
+    parser_upload.add_argument('--compress', choices=['gzip', 'zstd'], help='Compress objects before upload and set Content-Encoding')
+    parser_upload.add_argument('--workers', type=int, help='Number of concurrent uploads')
+    parser_upload.add_argument('--verify', choices=['md5', 'sha256', 'crc32', 'crc32c'], help='Verify uploaded data against its ETag or S3 checksum')
+    parser_upload.add_argument('--report', help='Write the integrity report as JSON to this path')
 
     subparsers.add_parser('s3-obj-list', help='List objects in S3 bucket')
 
@@ -105,6 +123,8 @@ def main():
         action='store_true',
         help='Interactively select objects to download'
     )
+    parser_download.add_argument('--verify', choices=['md5', 'sha256', 'crc32', 'crc32c'], help='Verify downloaded data against its ETag or S3 checksum')
+    parser_download.add_argument('--report', help='Write the integrity report as JSON to this path')
 
     parser_delete = subparsers.add_parser('s3-obj-delete', help='Delete object(s) from S3')
     parser_delete.add_argument('--obj-names', nargs='+', help='Object name(s) to delete')
@@ -125,12 +145,76 @@ def main():
         nargs='+',
         help='Name(s) of buckets to delete (ignored if --interactive is used)'
     )
+    parser_bucket_delete.add_argument('--workers', type=int, help='Number of buckets to tear down concurrently')
+
+    for name, verb in (('s3-copy', 'Copy'), ('s3-move', 'Move')):
+        parser_copy = subparsers.add_parser(
+            name, help=f'{verb} objects between buckets/prefixes server-side'
+        )
+        parser_copy.add_argument('--src-bucket', help='Source bucket (defaults to the configured bucket)')
+        parser_copy.add_argument('--dest-bucket', help='Destination bucket (defaults to the source bucket)')
+        parser_copy.add_argument('--prefix', default='', help='Only objects under this source prefix')
+        parser_copy.add_argument('--dest-prefix', default='', help='Prefix that replaces --prefix in the destination keys')
+        parser_copy.add_argument('--workers', type=int, help='Number of concurrent copies')
+
+    parser_du = subparsers.add_parser('s3-du', help='Show storage usage by prefix')
+    parser_du.add_argument('--bucket-names', nargs='+', help='Bucket(s) to analyse (defaults to the configured bucket)')
+    parser_du.add_argument('--all-buckets', action='store_true', help='Analyse every bucket in the account')
+    parser_du.add_argument('--depth', type=int, default=1, help='Prefix depth to aggregate at')
+    parser_du.add_argument('--top', type=int, default=10, help='Number of heaviest prefixes to show')
+    parser_du.add_argument('--workers', type=int, help='Number of buckets to scan in parallel')
+
+    parser_query = subparsers.add_parser('s3-query', help='Stream records matching a SQL filter from a CSV/JSON object')
+    parser_query.add_argument('--key', required=True, help='Object key to query')
+    parser_query.add_argument('--sql', required=True, help="e.g. \"SELECT * FROM S3Object s WHERE s.status = 'ERROR' LIMIT 10\"")
+    parser_query.add_argument('--format', choices=['csv', 'json'], default='csv', help='Input format (CSV with header row, or JSON lines)')
+    parser_query.add_argument('--bucket', help='Bucket to query (defaults to the configured bucket)')
+    parser_query.add_argument('--client-side', action='store_true', help='Skip S3 Select and filter locally over ranged reads')
+
+    parser_expire = subparsers.add_parser('s3-expire', help='Delete or transition objects by prefix, age, size and storage class')
+    parser_expire.add_argument('--bucket', help='Bucket to clean up (defaults to the configured bucket)')
+    parser_expire.add_argument('--prefix', default='', help='Only objects under this prefix')
+    parser_expire.add_argument('--older-than', type=int, help='Only objects last modified at least this many days ago')
+    parser_expire.add_argument('--larger-than', type=int, help='Only objects larger than this many bytes')
+    parser_expire.add_argument('--smaller-than', type=int, help='Only objects smaller than this many bytes')
+    parser_expire.add_argument('--storage-class', nargs='+', help='Only objects in these storage class(es)')
+    parser_expire.add_argument('--transition-to', help='Change storage class (e.g. GLACIER) instead of deleting')
+    parser_expire.add_argument('--dry-run', action='store_true', help='Report what would be affected without changing anything')
+    parser_expire.add_argument('--lifecycle', action='store_true', help='Apply an equivalent bucket lifecycle rule instead of acting client-side')
+    parser_expire.add_argument('--rule-id', default='aws-automation-expire', help='ID of the lifecycle rule to create or replace')
+    parser_expire.add_argument('--yes', action='store_true', help='Do not ask for confirmation')
+    parser_expire.add_argument('--workers', type=int, help='Number of concurrent batches/copies')
+
+    parser_run = subparsers.add_parser('run', help='Run a plan of S3/EC2 steps with dependencies')
+    parser_run.add_argument('--plan', required=True, help='Path to the plan YAML file')
+    parser_run.add_argument('--dry-run', action='store_true', help='Show the plan without running it')
+    parser_run.add_argument('--yes', action='store_true', help='Apply without asking for confirmation')
 
     args = parser.parse_args()
 
+    config = load_config(args.config, args.profile, args.region, required_fields(args))
+    tuning = config['tuning']
+    ec2.configure(tuning)
+    s3.configure(tuning)
+    if getattr(args, 'workers', None) is None:
+        args.workers = tuning['max_workers']
+
+    # One set of clients per process; the pool is sized for concurrent transfers
+    client_config = Config(
+        max_pool_connections=tuning['max_pool_connections'],
+        retries={'max_attempts': tuning['max_attempts'], 'mode': 'standard'},
+    )
+    s3_client = boto3.client('s3', region_name=config['s3']['region_name'], config=client_config)
+    ec2_client = boto3.client('ec2', region_name=config['aws']['region_name'], config=client_config)
+    ec2_resource = boto3.resource('ec2', region_name=config['aws']['region_name'], config=client_config)
+
+    def inventory_cache_path():
+        return default_cache_path(config['aws']['region_name'], account_key(boto3.session.Session()), config['profile'])
+
     # EC2 actions
     if args.command == 'create':
-        create_instance(ec2_resource, config)
+        if create_instance(ec2_resource, config) is None:
+            exit(1)
 
     elif args.command == 'start':
         start_instance(ec2_client, args.instance_id)
@@ -142,14 +226,38 @@ def main():
         terminate_instance(ec2_client, args.instance_id)
 
     elif args.command == 'list':
-        list_running_instances(ec2_client)
+        if args.diff:
+            show_inventory_diff(ec2_client, inventory_cache_path(), args.full_refresh)
+        elif args.cached:
+            list_cached_instances(ec2_client, inventory_cache_path(), tuning['inventory_ttl'])
+        else:
+            list_running_instances(ec2_client)
+
+    elif args.command == 'exec':
+        if args.cached:
+            instances = list_cached_instances(ec2_client, inventory_cache_path(), tuning['inventory_ttl'])
+        else:
+            instances = list_running_instances(ec2_client)
+        if args.instance_ids:
+            instances = [i for i in instances if i['Instance ID'] in args.instance_ids]
+        report = run_on_instances(
+            instances,
+            args.remote_command,
+            args.key_path or default_key_path(config['aws']['key_name']),
+            args.user,
+            args.private_ip,
+            args.workers,
+            args.timeout,
+        )
+        if any(host['Status'] != 'OK' for host in report):
+            exit(1)
 
     # S3 actions
     elif args.command == 's3-create':
         create_bucket(s3_client, config['s3']['bucket_name'], config['s3']['region_name'])
 
     elif args.command == 's3-obj-upload':
-        upload_objects(s3_client, config['s3']['bucket_name'], args.obj_paths)
+        upload_objects(s3_client, config['s3']['bucket_name'], args.obj_paths, args.compress, args.workers, args.verify, args.report)
 
     elif args.command == 's3-obj-list':
         list_objects(s3_client, config['s3']['bucket_name'])
@@ -167,7 +275,7 @@ def main():
         if not obj_names:
             log.error("❌ No object names provided for download.")
             return
-        download_objects(s3_client, config['s3']['bucket_name'], obj_names, args.dest)
+        download_objects(s3_client, config['s3']['bucket_name'], obj_names, args.dest, args.verify, args.report)
 
     elif args.command == 's3-obj-delete':
         obj_names = args.obj_names or []
@@ -196,12 +304,97 @@ def main():
             # fallback to config bucket name if no bucket names provided
             bucket_names = [config['s3']['bucket_name']]
 
-        for bucket_name in bucket_names:
-            confirm = input(f"⚠️ Are you sure you want to delete bucket '{bucket_name}'? [y/N]: ")
+        if len(bucket_names) == 1:
+            confirm = input(f"⚠️ Are you sure you want to delete bucket '{bucket_names[0]}'? [y/N]: ")
             if confirm.lower() == 'y':
-                delete_bucket(s3_client, bucket_name)
+                delete_bucket(s3_client, bucket_names[0])
             else:
-                log.info(f"❎ Deletion of bucket '{bucket_name}' aborted by user.")
+                log.info(f"❎ Deletion of bucket '{bucket_names[0]}' aborted by user.")
+            return
+
+        confirm = input(
+            f"⚠️ Are you sure you want to delete {len(bucket_names)} buckets, including all "
+            f"object versions ({', '.join(bucket_names)})? [y/N]: "
+        )
+        if confirm.lower() == 'y':
+            delete_buckets(s3_client, bucket_names, args.workers)
+        else:
+            log.info("❎ Deletion of buckets aborted by user.")
+
+    elif args.command in ('s3-copy', 's3-move'):
+        src_bucket = args.src_bucket or config['s3']['bucket_name']
+        dest_bucket = args.dest_bucket or src_bucket
+        transfer = copy_objects if args.command == 's3-copy' else move_objects
+        transfer(s3_client, src_bucket, dest_bucket, args.prefix, args.dest_prefix, args.workers)
+
+    elif args.command == 's3-du':
+        if args.all_buckets:
+            bucket_names = [b['Bucket Name'] for b in list_buckets(s3_client, config['s3']['region_name'], return_list=True)]
+        else:
+            bucket_names = args.bucket_names or [config['s3']['bucket_name']]
+        bucket_usage(s3_client, bucket_names, args.depth, args.top, args.workers)
+
+    elif args.command == 's3-query':
+        bucket_name = args.bucket or config['s3']['bucket_name']
+        query_object(s3_client, bucket_name, args.key, args.sql, args.format, not args.client_side)
+
+    elif args.command == 's3-expire':
+        bucket_name = args.bucket or config['s3']['bucket_name']
+        criteria = dict(
+            prefix=args.prefix,
+            older_than_days=args.older_than,
+            larger_than=args.larger_than,
+            smaller_than=args.smaller_than,
+        )
+        if args.lifecycle:
+            if args.storage_class:
+                log.error("❌ Lifecycle rules cannot filter by storage class.")
+                return
+            try:
+                rule = lifecycle_rule(args.rule_id, transition_to=args.transition_to, **criteria)
+            except ValueError as e:
+                log.error(f"❌ {str(e)}")
+                return
+            if not args.dry_run and not args.yes:
+                confirm = input(f"⚠️ Apply lifecycle rule '{args.rule_id}' to bucket '{bucket_name}'? [y/N]: ")
+                if confirm.lower() != 'y':
+                    log.info("❎ Lifecycle update aborted by user.")
+                    return
+            apply_lifecycle_rule(s3_client, bucket_name, rule, args.dry_run)
+            return
+
+        if not args.dry_run and not args.yes:
+            action = f"transition to {args.transition_to}" if args.transition_to else "DELETE"
+            confirm = input(f"⚠️ Are you sure you want to {action} matching objects in '{bucket_name}'? [y/N]: ")
+            if confirm.lower() != 'y':
+                log.info("❎ Expiry aborted by user.")
+                return
+        expire_objects(
+            s3_client,
+            bucket_name,
+            storage_classes=args.storage_class,
+            transition_to=args.transition_to,
+            dry_run=args.dry_run,
+            max_workers=args.workers,
+            **criteria,
+        )
+
+    elif args.command == 'run':
+        plan = load_plan(args.plan, tuning['max_workers'])
+        if plan is None:
+            exit(1)
+        show_plan(plan)
+        if args.dry_run:
+            return
+        if not args.yes:
+            confirm = input("⚠️ Apply this plan? [y/N]: ")
+            if confirm.lower() != 'y':
+                log.info("❎ Plan aborted by user.")
+                return
+        clients = {'s3': s3_client, 'ec2': ec2_client, 'ec2_resource': ec2_resource}
+        report = run_plan(plan, clients, config)
+        if any(step['Status'] != 'OK' for step in report):
+            exit(1)
 
     else:
         parser.print_help()
@@ -6,6 +6,8 @@ from aws_automation.ec2 import (
     stop_instance,
     terminate_instance,
     list_running_instances,
+    wait_for_instance,
+    create_instance,
 )
 from botocore.exceptions import ClientError
 from botocore.exceptions import BotoCoreError
@@ -127,3 +129,33 @@ def test_terminate_instance_invalid_id(monkeypatch, ec2_client):
 
     response = terminate_instance(ec2_client, "i-invalidid")
     assert response is None
+
+
+def test_terminate_instance_without_confirmation(monkeypatch, ec2_client, instance_id):
+    def fail_input(_):
+        raise AssertionError("should not prompt")
+
+    monkeypatch.setattr("builtins.input", fail_input)
+    response = terminate_instance(ec2_client, instance_id, confirm=False)
+    assert response["TerminatingInstances"][0]["InstanceId"] == instance_id
+
+
+def test_wait_for_instance(ec2_client, instance_id):
+    ec2_client.stop_instances(InstanceIds=[instance_id])
+    assert wait_for_instance(ec2_client, instance_id, "stopped") is True
+
+
+def test_create_instance(ec2_client):
+    ec2_resource = boto3.resource("ec2", region_name=REGION)
+    ec2_client.create_security_group(GroupName="test-sg", Description="test")
+    config = {
+        "aws": {
+            "ami_id": "ami-12345678",
+            "instance_type": "t2.micro",
+            "key_name": "test-key",
+            "security_group_name": "test-sg",
+            "instance_name": "test-instance",
+        }
+    }
+    instance = create_instance(ec2_resource, config)
+    assert instance.state["Name"] == "running"
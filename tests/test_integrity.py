@@ -0,0 +1,127 @@
+import hashlib
+import os
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from aws_automation import integrity, s3
+
+BUCKET = "integrity-bucket"
+
+
+@pytest.fixture
+def s3_client():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def test_hash_parts_matches_sequential_hash(tmp_path):
+    data = os.urandom(3 * 1024 + 17)
+    path = tmp_path / "data.bin"
+    path.write_bytes(data)
+
+    with open(path, "rb") as file:
+        parts = integrity.hash_parts(file, "md5", part_size=1024, max_workers=3)
+    expected = [
+        hashlib.md5(data[i : i + 1024]).digest() for i in range(0, len(data), 1024)
+    ]
+    assert parts == expected
+
+
+def test_hash_parts_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with open(path, "rb") as file:
+        assert integrity.hash_parts(file, "sha256") == [hashlib.sha256(b"").digest()]
+
+
+def test_upload_objects_verifies_multipart_etag(s3_client, tmp_path):
+    path = tmp_path / "big.bin"
+    path.write_bytes(os.urandom(integrity.PART_SIZE * 2 + 100))
+    report_path = tmp_path / "report.json"
+
+    result = s3.upload_objects(
+        s3_client, BUCKET, [str(path)], verify="md5", report_path=str(report_path)
+    )
+    assert result is True
+    etag = s3_client.head_object(Bucket=BUCKET, Key="big.bin")["ETag"]
+    assert etag.strip('"').endswith("-3")
+    assert '"Status": "OK"' in report_path.read_text()
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "crc32"])
+@pytest.mark.parametrize("size", [100, integrity.PART_SIZE + 100])
+def test_upload_and_download_verify_checksum(s3_client, tmp_path, algorithm, size):
+    path = tmp_path / "data.bin"
+    path.write_bytes(os.urandom(size))
+    report_path = tmp_path / "report.json"
+    assert s3.upload_objects(
+        s3_client, BUCKET, [str(path)], verify=algorithm, report_path=str(report_path)
+    )
+    assert '"Status": "OK"' in report_path.read_text()
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+    assert s3.download_objects(
+        s3_client,
+        BUCKET,
+        ["data.bin"],
+        str(dest),
+        verify=algorithm,
+        report_path=str(report_path),
+    )
+    assert '"Status": "OK"' in report_path.read_text()
+
+
+def test_verify_object_detects_mismatch(s3_client, tmp_path):
+    s3_client.put_object(Bucket=BUCKET, Key="file.txt", Body=b"original")
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"corrupted")
+
+    with open(path, "rb") as file:
+        row = integrity.verify_object(s3_client, BUCKET, "file.txt", file, "md5")
+    assert row["Status"] == "MISMATCH"
+    assert row["Expected"] == hashlib.md5(b"original").hexdigest()
+
+
+def test_verify_object_md5_unavailable_for_kms_objects(s3_client, tmp_path):
+    s3_client.put_object(
+        Bucket=BUCKET, Key="file.txt", Body=b"secret", ServerSideEncryption="aws:kms"
+    )
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"secret")
+
+    with open(path, "rb") as file:
+        row = integrity.verify_object(s3_client, BUCKET, "file.txt", file, "md5")
+    assert row["Status"] == "UNAVAILABLE"
+
+
+@pytest.mark.parametrize("algorithm", ["md5", "sha256"])
+def test_download_verify_hashes_during_transfer(
+    s3_client, tmp_path, monkeypatch, algorithm
+):
+    data = os.urandom(integrity.PART_SIZE * 2 + 100)
+    path = tmp_path / "big.bin"
+    path.write_bytes(data)
+    assert s3.upload_objects(s3_client, BUCKET, [str(path)], verify=algorithm)
+
+    def no_second_pass(*args, **kwargs):
+        raise AssertionError("downloaded file was hashed again")
+
+    monkeypatch.setattr(integrity, "hash_parts", no_second_pass)
+    dest = tmp_path / "out"
+    dest.mkdir()
+    report_path = tmp_path / "report.json"
+    assert s3.download_objects(
+        s3_client,
+        BUCKET,
+        ["big.bin"],
+        str(dest),
+        verify=algorithm,
+        report_path=str(report_path),
+    )
+    assert (dest / "big.bin").read_bytes() == data
+    assert '"Status": "OK"' in report_path.read_text()
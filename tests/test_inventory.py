@@ -0,0 +1,113 @@
+import time
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from aws_automation import inventory
+
+REGION = "us-east-1"
+
+
+@pytest.fixture
+def ec2_client():
+    with mock_aws():
+        yield boto3.client("ec2", region_name=REGION)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache" / "inventory.json.gz")
+
+
+def launch(ec2_client, count=1):
+    reservation = ec2_client.run_instances(
+        ImageId="ami-12345678", InstanceType="t2.micro", MinCount=count, MaxCount=count
+    )
+    return [i["InstanceId"] for i in reservation["Instances"]]
+
+
+def test_list_cached_instances_uses_fresh_cache(ec2_client, cache_path):
+    ids = launch(ec2_client, 2)
+    first = inventory.list_cached_instances(ec2_client, cache_path, ttl=60)
+    assert sorted(i["Instance ID"] for i in first) == sorted(ids)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache should have been used")
+
+    ec2_client.get_paginator = fail
+    second = inventory.list_cached_instances(ec2_client, cache_path, ttl=60)
+    assert second == first
+
+
+def test_refresh_only_redescribes_changed_instances(
+    ec2_client, cache_path, monkeypatch
+):
+    stopped, untouched = launch(ec2_client, 2)
+    inventory.refresh_inventory(ec2_client, cache_path, ttl=0)
+
+    ec2_client.stop_instances(InstanceIds=[stopped])
+    added = launch(ec2_client)[0]
+    described = []
+    real_describe = inventory._describe
+
+    def spy(client, instance_ids=None):
+        described.append(instance_ids)
+        return real_describe(client, instance_ids)
+
+    monkeypatch.setattr(inventory, "_describe", spy)
+    snapshot, changes = inventory.refresh_inventory(ec2_client, cache_path, ttl=0)
+
+    assert described == [{stopped, added}]
+    assert changes["added"] == [added]
+    assert changes["removed"] == []
+    assert [(i, f["State"][1]) for i, f in changes["changed"]] == [(stopped, "stopped")]
+    assert (
+        snapshot["instances"][untouched][inventory.FIELDS.index("State")] == "running"
+    )
+
+
+def test_show_inventory_diff_reports_removed(ec2_client, cache_path):
+    instance_id = launch(ec2_client)[0]
+    inventory.refresh_inventory(ec2_client, cache_path)
+
+    cached = inventory.load_inventory(cache_path)
+    cached["instances"]["i-gone0000000000000"] = [
+        "t2.micro",
+        "N/A",
+        "N/A",
+        "running",
+        "",
+    ]
+    cached["fetched_at"] = time.time() - 3600
+    inventory.save_inventory(cache_path, cached)
+
+    changes = inventory.show_inventory_diff(ec2_client, cache_path)
+    assert changes["removed"] == ["i-gone0000000000000"]
+    assert instance_id not in changes["added"]
+
+
+def test_load_inventory_missing_or_corrupt(tmp_path):
+    assert inventory.load_inventory(str(tmp_path / "missing.json.gz")) is None
+    corrupt = tmp_path / "corrupt.json.gz"
+    corrupt.write_bytes(b"not gzip")
+    assert inventory.load_inventory(str(corrupt)) is None
+
+
+def test_default_cache_path_is_per_account_and_profile(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIAFIRST")
+    session = boto3.session.Session()
+    first = inventory.account_key(session)
+    assert first == inventory.account_key(session)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIASECOND")
+    second = inventory.account_key(session)
+    assert first != second
+
+    paths = {
+        inventory.default_cache_path(REGION, first),
+        inventory.default_cache_path(REGION, first, "dev"),
+        inventory.default_cache_path(REGION, second, "dev"),
+    }
+    assert len(paths) == 3
+    assert all(p.startswith(str(tmp_path)) for p in paths)
@@ -0,0 +1,122 @@
+import io
+import json
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from moto import mock_aws
+
+from aws_automation import query
+
+BUCKET = "query-bucket"
+CSV_BODY = "id,name,status,latency\n1,api,OK,12\n2,db,ERROR,250\n3,web,ERROR,40\n"
+
+
+@pytest.fixture
+def s3_client():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+def unsupported_select(*args, **kwargs):
+    raise ClientError(
+        {"Error": {"Code": "MethodNotAllowed", "Message": "Not allowed"}},
+        "SelectObjectContent",
+    )
+
+
+def test_parse_query():
+    columns, conditions, limit = query.parse_query(
+        'SELECT s.id, s."name" FROM S3Object s '
+        "WHERE s.status = 'ERROR' AND CAST(s.latency AS INT) > 100 LIMIT 5"
+    )
+    assert columns == ["id", "name"]
+    assert [(c, v) for c, _, v in conditions] == [("status", "ERROR"), ("latency", 100)]
+    assert limit == 5
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "SELECT * FROM S3Object WHERE a = 1 OR b = 2",
+        "SELECT count(*) FROM S3Object",
+        "SELECT s.a + 1 FROM S3Object s",
+    ],
+)
+def test_parse_query_rejects_unsupported(expression):
+    with pytest.raises(ValueError):
+        query.parse_query(expression)
+
+
+def test_query_object_falls_back_to_client_side(s3_client):
+    s3_client.put_object(Bucket=BUCKET, Key="data.csv", Body=CSV_BODY)
+    s3_client.select_object_content = unsupported_select
+    out = io.StringIO()
+
+    result = query.query_object(
+        s3_client,
+        BUCKET,
+        "data.csv",
+        "SELECT s.name FROM S3Object s WHERE s.status = 'ERROR' "
+        "AND CAST(s.latency AS INT) > 100",
+        out=out,
+    )
+    assert result is True
+    assert out.getvalue() == "db\n"
+
+
+def test_filter_object_json_lines_with_limit(s3_client, monkeypatch):
+    records = [{"id": i, "level": "warn" if i % 2 else "info"} for i in range(50)]
+    body = "\n".join(json.dumps(r) for r in records)
+    s3_client.put_object(Bucket=BUCKET, Key="events.json", Body=body)
+    # Force several ranged reads so records straddle range boundaries
+    monkeypatch.setattr(query, "RANGE_SIZE", 64)
+    out = io.StringIO()
+
+    query.query_object(
+        s3_client,
+        BUCKET,
+        "events.json",
+        "SELECT * FROM S3Object WHERE level = 'warn' LIMIT 3",
+        input_format="json",
+        use_select=False,
+        out=out,
+    )
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["id"] for r in lines] == [1, 3, 5]
+
+
+def test_iter_lines_ranged(s3_client):
+    s3_client.put_object(Bucket=BUCKET, Key="data.csv", Body=CSV_BODY)
+    lines = list(query.iter_lines(s3_client, BUCKET, "data.csv", range_size=7))
+    assert lines == CSV_BODY.splitlines()
+
+
+def test_query_object_uses_select_when_available(s3_client):
+    def fake_select(**kwargs):
+        assert kwargs["InputSerialization"] == {"CSV": {"FileHeaderInfo": "USE"}}
+        return {
+            "Payload": [
+                {"Records": {"Payload": b"db\n"}},
+                {"Stats": {}},
+                {"End": {}},
+            ]
+        }
+
+    s3_client.select_object_content = fake_select
+    out = io.StringIO()
+    result = query.query_object(
+        s3_client, BUCKET, "data.csv", "SELECT s.name FROM S3Object s", out=out
+    )
+    assert result is True
+    assert out.getvalue() == "db\n"
+
+
+def test_query_object_missing_key(s3_client):
+    s3_client.select_object_content = unsupported_select
+    result = query.query_object(
+        s3_client, BUCKET, "missing.csv", "SELECT * FROM S3Object", out=io.StringIO()
+    )
+    assert result is False
@@ -0,0 +1,99 @@
+import io
+import os
+import stat
+
+import pytest
+
+from aws_automation import remote
+
+# Stands in for ssh: runs the command locally, except on the "hung" host
+FAKE_SSH = """#!/bin/sh
+target="$9"
+shift 9
+case "$target" in
+  *@10.0.0.9) exec sleep 30 ;;
+esac
+echo "connected to $target"
+exec sh -c "$1"
+"""
+
+
+@pytest.fixture
+def fake_ssh(tmp_path):
+    path = tmp_path / "ssh"
+    path.write_text(FAKE_SSH)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+def _instance(instance_id, public, private):
+    return {"Instance ID": instance_id, "Public IP": public, "Private IP": private}
+
+
+def test_select_hosts_prefers_public_ip():
+    instances = [
+        _instance("i-1", "1.2.3.4", "10.0.0.1"),
+        _instance("i-2", "N/A", "10.0.0.2"),
+        _instance("i-3", "N/A", "N/A"),
+    ]
+    assert remote.select_hosts(instances) == [("i-1", "1.2.3.4"), ("i-2", "10.0.0.2")]
+    assert remote.select_hosts(instances, private=True) == [
+        ("i-1", "10.0.0.1"),
+        ("i-2", "10.0.0.2"),
+    ]
+
+
+def test_ssh_command_uses_key_and_batch_mode():
+    argv = remote.ssh_command("1.2.3.4", "uptime", "ec2-user", "/k.pem")
+    assert argv[:3] == ["ssh", "-i", "/k.pem"]
+    assert "BatchMode=yes" in argv
+    assert argv[-2:] == ["ec2-user@1.2.3.4", "uptime"]
+    assert remote.default_key_path("my-key").endswith(
+        os.path.join(".ssh", "my-key.pem")
+    )
+
+
+def test_run_on_instances_streams_output(fake_ssh):
+    out = io.StringIO()
+    instances = [
+        _instance("i-1", "N/A", "10.0.0.1"),
+        _instance("i-2", "N/A", "10.0.0.2"),
+    ]
+    report = remote.run_on_instances(
+        instances, "echo ok", "/k.pem", max_workers=2, ssh_binary=fake_ssh, out=out
+    )
+    assert [r["Status"] for r in report] == ["OK", "OK"]
+    lines = out.getvalue().splitlines()
+    assert "[i-1] connected to ec2-user@10.0.0.1" in lines
+    assert "[i-2] ok" in lines
+
+
+def test_run_on_instances_reports_failures_and_timeouts(fake_ssh):
+    instances = [
+        _instance("i-1", "10.0.0.1", "N/A"),
+        _instance("i-9", "10.0.0.9", "N/A"),
+    ]
+    report = remote.run_on_instances(
+        instances,
+        "exit 3",
+        "/k.pem",
+        timeout=1,
+        ssh_binary=fake_ssh,
+        out=io.StringIO(),
+    )
+    by_id = {r["Instance ID"]: r for r in report}
+    assert by_id["i-1"]["Status"] == "FAILED"
+    assert by_id["i-1"]["Exit"] == 3
+    assert by_id["i-9"]["Status"] == "TIMEOUT"
+    assert by_id["i-9"]["Duration"] < 10
+
+
+def test_run_on_instances_missing_ssh_binary(tmp_path):
+    report = remote.run_on_instances(
+        [_instance("i-1", "1.2.3.4", "N/A")],
+        "uptime",
+        "/k.pem",
+        ssh_binary=str(tmp_path / "no-ssh"),
+        out=io.StringIO(),
+    )
+    assert report[0]["Status"] == "ERROR"
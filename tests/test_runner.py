@@ -0,0 +1,172 @@
+import threading
+import time
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from aws_automation import runner
+
+CONFIG = {
+    "aws": {"region_name": "us-east-1"},
+    "s3": {"bucket_name": "plan-bucket", "region_name": "us-east-1"},
+}
+
+
+@pytest.fixture
+def clients():
+    with mock_aws():
+        yield {
+            "s3": boto3.client("s3", region_name="us-east-1"),
+            "ec2": boto3.client("ec2", region_name="us-east-1"),
+            "ec2_resource": boto3.resource("ec2", region_name="us-east-1"),
+        }
+
+
+def statuses(report):
+    return {r["Step"]: r["Status"] for r in report}
+
+
+def test_validate_plan_rejects_cycle():
+    plan = {
+        "steps": [
+            {"name": "a", "action": "list", "depends_on": ["b"]},
+            {"name": "b", "action": "list", "depends_on": ["a"]},
+        ]
+    }
+    with pytest.raises(ValueError, match="cycle"):
+        runner.validate_plan(plan)
+
+
+@pytest.mark.parametrize(
+    "step",
+    [
+        {"name": "a", "action": "nope"},
+        {"name": "a", "action": "start", "args": {"bad": 1}},
+        {"name": "a", "action": "list", "depends_on": ["missing"]},
+        {"name": "a", "action": "list", "depends_on": "missing"},
+        {"name": "a", "action": "list", "args": ["x"]},
+        {"name": "a", "action": "list", "depends_on": [{"x": 1}]},
+        {"name": ["a"], "action": "list"},
+        {"name": "a", "action": ["list"]},
+        ["list"],
+    ],
+)
+def test_validate_plan_rejects_invalid_steps(step):
+    with pytest.raises(ValueError):
+        runner.validate_plan({"steps": [step]})
+
+
+@pytest.mark.parametrize("max_workers", [None, True, "4", 0])
+def test_validate_plan_rejects_invalid_max_workers(max_workers):
+    with pytest.raises(ValueError):
+        runner.validate_plan(
+            {"max_workers": max_workers, "steps": [{"name": "a", "action": "list"}]}
+        )
+
+
+def test_load_plan_invalid_file(tmp_path):
+    path = tmp_path / "plan.yaml"
+    path.write_text("steps: not-a-list\n")
+    assert runner.load_plan(str(path)) is None
+
+
+def test_run_plan_with_dependencies(clients, tmp_path):
+    file_path = tmp_path / "data.txt"
+    file_path.write_text("dummy content")
+    plan_path = tmp_path / "plan.yaml"
+    plan_path.write_text(f"""
+max_workers: 4
+steps:
+  - name: source
+    action: s3-create
+  - name: target
+    action: s3-create
+    args: {{bucket_name: plan-target}}
+  - name: upload
+    action: s3-obj-upload
+    depends_on: [source]
+    args: {{obj_paths: ["{file_path}"]}}
+  - name: copy
+    action: s3-copy
+    depends_on: [upload, target]
+    args: {{dest_bucket: plan-target}}
+""")
+
+    report = runner.run_plan(runner.load_plan(str(plan_path)), clients, CONFIG)
+    assert set(statuses(report).values()) == {"OK"}
+    objects = clients["s3"].list_objects_v2(Bucket="plan-target")["Contents"]
+    assert [o["Key"] for o in objects] == ["data.txt"]
+
+
+def test_run_plan_skips_dependents_of_failed_step(clients):
+    plan = runner.validate_plan(
+        {
+            "steps": [
+                {
+                    "name": "upload",
+                    "action": "s3-obj-upload",
+                    "args": {"obj_paths": ["x"]},
+                },
+                {"name": "copy", "action": "s3-copy", "depends_on": ["upload"]},
+                {"name": "list", "action": "list", "depends_on": ["copy"]},
+                {"name": "other", "action": "s3-bucket-list"},
+            ]
+        }
+    )
+    report = runner.run_plan(plan, clients, CONFIG)
+    assert statuses(report) == {
+        "upload": "FAILED",
+        "copy": "SKIPPED",
+        "list": "SKIPPED",
+        "other": "OK",
+    }
+
+
+def test_run_plan_runs_independent_steps_concurrently(monkeypatch):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow(clients, config):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return True
+
+    monkeypatch.setitem(runner.ACTIONS, "slow", slow)
+    plan = runner.validate_plan(
+        {
+            "max_workers": 2,
+            "steps": [{"name": f"s{i}", "action": "slow"} for i in range(4)],
+        }
+    )
+    report = runner.run_plan(plan, {}, CONFIG)
+    assert set(statuses(report).values()) == {"OK"}
+    assert peak[0] == 2
+    assert all(r["Duration"] >= 0.1 for r in report)
+
+
+def test_run_plan_shares_one_worker_budget(monkeypatch):
+    budgets = []
+
+    def record(clients, config, workers=None):
+        budgets.append(runner._workers(config, workers))
+        return True
+
+    monkeypatch.setitem(runner.ACTIONS, "record", record)
+    plan = runner.validate_plan(
+        {
+            "max_workers": 4,
+            "steps": [
+                {"name": "a", "action": "record"},
+                {"name": "b", "action": "record", "args": {"workers": 50}},
+                {"name": "c", "action": "record", "args": {"workers": 1}},
+            ],
+        }
+    )
+    config = {**CONFIG, "tuning": {"max_workers": 8}}
+    runner.run_plan(plan, {}, config)
+    assert sorted(budgets) == [1, 2, 2]
+    assert runner.step_budget(plan, {"tuning": {"max_workers": 2}}) == (2, 1)
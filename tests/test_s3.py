@@ -3,6 +3,8 @@ from moto import mock_aws
 import boto3
 from aws_automation import s3
 import os
+import zlib
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
 
@@ -148,3 +150,352 @@ def test_list_buckets_client_error(s3_client):
     s3_client.list_buckets = mock_list_buckets
     result = s3.list_buckets(s3_client, "us-east-1", return_list=True)
     assert result == []
+
+
+def test_copy_objects_between_buckets(s3_client):
+    s3_client.create_bucket(Bucket="src-bucket")
+    s3_client.create_bucket(Bucket="dest-bucket")
+    for key in ["logs/a.txt", "logs/b.txt", "other/c.txt"]:
+        s3_client.put_object(Bucket="src-bucket", Key=key, Body=b"data")
+
+    result = s3.copy_objects(
+        s3_client, "src-bucket", "dest-bucket", prefix="logs/", dest_prefix="archive/"
+    )
+    assert result is True
+
+    copied = s3.list_objects(s3_client, "dest-bucket", return_list=True)
+    assert sorted(copied) == ["archive/a.txt", "archive/b.txt"]
+    assert len(s3.list_objects(s3_client, "src-bucket", return_list=True)) == 3
+
+
+def test_move_objects_deletes_source(s3_client):
+    s3_client.create_bucket(Bucket="src-bucket")
+    s3_client.create_bucket(Bucket="dest-bucket")
+    for i in range(5):
+        s3_client.put_object(Bucket="src-bucket", Key=f"file{i}.txt", Body=b"x")
+
+    result = s3.move_objects(s3_client, "src-bucket", "dest-bucket", max_workers=2)
+    assert result is True
+    assert s3.list_objects(s3_client, "src-bucket", return_list=True) == []
+    assert len(s3.list_objects(s3_client, "dest-bucket", return_list=True)) == 5
+
+
+def test_copy_object_multipart(s3_client):
+    s3_client.create_bucket(Bucket="src-bucket")
+    s3_client.create_bucket(Bucket="dest-bucket")
+    body = os.urandom(6 * 1024**2)
+    s3_client.put_object(
+        Bucket="src-bucket",
+        Key="big.bin",
+        Body=body,
+        Metadata={"owner": "ops"},
+        ContentEncoding="gzip",
+        CacheControl="max-age=60",
+        Tagging="team=ops&tier=hot",
+    )
+
+    s3.copy_object(
+        s3_client,
+        "src-bucket",
+        "big.bin",
+        "dest-bucket",
+        "big.bin",
+        multipart_threshold=0,
+        part_size=5 * 1024**2,
+    )
+
+    copied = s3_client.get_object(Bucket="dest-bucket", Key="big.bin")
+    assert copied["Body"].read() == body
+    assert copied["Metadata"] == {"owner": "ops"}
+    assert copied["ContentEncoding"].split(",")[0] == "gzip"
+    assert copied["CacheControl"] == "max-age=60"
+    tags = s3_client.get_object_tagging(Bucket="dest-bucket", Key="big.bin")
+    assert {t["Key"]: t["Value"] for t in tags["TagSet"]} == {
+        "team": "ops",
+        "tier": "hot",
+    }
+
+
+def test_copy_objects_rejects_overlapping_prefixes(s3_client):
+    s3_client.create_bucket(Bucket="src-bucket")
+    s3_client.put_object(Bucket="src-bucket", Key="a.txt", Body=b"a")
+
+    assert not s3.copy_objects(s3_client, "src-bucket", "src-bucket", "", "backup/")
+    assert not s3.move_objects(s3_client, "src-bucket", "src-bucket", "data/", "")
+    assert s3_client.list_objects_v2(Bucket="src-bucket")["KeyCount"] == 1
+
+
+def test_move_objects_deletes_in_batches(s3_client, monkeypatch):
+    s3_client.create_bucket(Bucket="src-bucket")
+    s3_client.create_bucket(Bucket="dest-bucket")
+    for i in range(5):
+        s3_client.put_object(Bucket="src-bucket", Key=f"k{i}", Body=b"x")
+    batches = []
+    delete_keys_batched = s3.delete_keys_batched
+
+    def record(client, bucket_name, keys):
+        batches.append(len(keys))
+        return delete_keys_batched(client, bucket_name, keys)
+
+    monkeypatch.setattr(s3, "DELETE_BATCH_SIZE", 2)
+    monkeypatch.setattr(s3, "delete_keys_batched", record)
+
+    assert s3.move_objects(s3_client, "src-bucket", "dest-bucket", max_workers=1)
+    assert batches == [2, 2, 1]
+    assert s3_client.list_objects_v2(Bucket="src-bucket")["KeyCount"] == 0
+    assert s3_client.list_objects_v2(Bucket="dest-bucket")["KeyCount"] == 5
+
+
+def test_copy_objects_missing_bucket(s3_client):
+    s3_client.create_bucket(Bucket="src-bucket")
+    assert s3.copy_objects(s3_client, "src-bucket", "missing-bucket") is False
+
+
+def test_bucket_usage_aggregates_by_prefix(s3_client):
+    s3_client.create_bucket(Bucket="usage-a")
+    s3_client.create_bucket(Bucket="usage-b")
+    s3_client.put_object(Bucket="usage-a", Key="logs/2024/a.log", Body=b"x" * 100)
+    s3_client.put_object(Bucket="usage-a", Key="logs/2025/b.log", Body=b"x" * 50)
+    s3_client.put_object(Bucket="usage-a", Key="root.txt", Body=b"x" * 10)
+    s3_client.put_object(
+        Bucket="usage-b", Key="data/c.bin", Body=b"x" * 500, StorageClass="GLACIER"
+    )
+
+    rows = s3.bucket_usage(s3_client, ["usage-a", "usage-b"], return_list=True)
+    assert [(r["Bucket Name"], r["Prefix"]) for r in rows] == [
+        ("usage-b", "data/"),
+        ("usage-a", "logs/"),
+        ("usage-a", "/"),
+    ]
+    assert rows[0]["StorageClasses"] == {"GLACIER": 500}
+    assert rows[1]["Objects"] == 2
+    assert rows[1]["Ages"] == {"<30d": 2}
+
+    top = s3.bucket_usage(s3_client, ["usage-a"], depth=2, top=1, return_list=True)
+    assert [(r["Prefix"], r["Size"]) for r in top] == [("logs/2024/", 100)]
+
+
+def test_upload_and_download_gzip_roundtrip(s3_client, tmp_path):
+    s3_client.create_bucket(Bucket="compress-bucket")
+    src = tmp_path / "app.log"
+    src.write_text("GET /health 200\n" * 10000)
+
+    result = s3.upload_objects(s3_client, "compress-bucket", [str(src)], "gzip")
+    assert result is True
+
+    head = s3_client.head_object(Bucket="compress-bucket", Key="app.log")
+    assert head["ContentEncoding"].split(",")[0] == "gzip"
+    assert head["Metadata"]["uncompressed-size"] == str(src.stat().st_size)
+    assert head["ContentLength"] < src.stat().st_size
+
+    dest = tmp_path / "out"
+    dest.mkdir()
+    assert s3.download_objects(s3_client, "compress-bucket", ["app.log"], str(dest))
+    assert (dest / "app.log").read_text() == src.read_text()
+
+
+@pytest.mark.parametrize("algorithm", ["md5", "sha256"])
+def test_upload_objects_streams_compression_multipart(s3_client, tmp_path, algorithm):
+    # Random bytes don't shrink, so the gzip stream spans several parts
+    s3_client.create_bucket(Bucket="compress-bucket")
+    src = tmp_path / "big.bin"
+    src.write_bytes(os.urandom(s3.PART_SIZE * 2 + 100))
+    report = tmp_path / "report.json"
+
+    assert s3.upload_objects(
+        s3_client,
+        "compress-bucket",
+        [str(src)],
+        "gzip",
+        verify=algorithm,
+        report_path=str(report),
+    )
+    assert '"Status": "OK"' in report.read_text()
+    # moto reports multipart composite checksums without the -N suffix, which
+    # botocore would validate as a whole-object checksum
+    reader = boto3.client(
+        "s3",
+        region_name="us-east-1",
+        config=Config(response_checksum_validation="when_required"),
+    )
+    dest = tmp_path / "out"
+    dest.mkdir()
+    assert s3.download_objects(reader, "compress-bucket", ["big.bin"], str(dest))
+    assert (dest / "big.bin").read_bytes() == src.read_bytes()
+
+
+def test_upload_objects_compression_failure_leaves_no_object(
+    s3_client, tmp_path, monkeypatch
+):
+    class Broken:
+        def compress(self, data):
+            raise zlib.error("boom")
+
+    s3_client.create_bucket(Bucket="compress-bucket")
+    src = tmp_path / "app.log"
+    src.write_text("line\n" * 100)
+    monkeypatch.setitem(s3.CODECS, "gzip", (Broken, None))
+
+    assert not s3.upload_objects(s3_client, "compress-bucket", [str(src)], "gzip")
+    assert s3_client.list_objects_v2(Bucket="compress-bucket")["KeyCount"] == 0
+
+
+def test_upload_objects_zstd_roundtrip(s3_client, tmp_path):
+    pytest.importorskip("zstandard")
+    s3_client.create_bucket(Bucket="compress-bucket")
+    src = tmp_path / "data.json"
+    src.write_text('{"id": 1}\n' * 5000)
+
+    assert s3.upload_objects(s3_client, "compress-bucket", [str(src)], "zstd")
+    dest = tmp_path / "out"
+    dest.mkdir()
+    assert s3.download_objects(s3_client, "compress-bucket", ["data.json"], str(dest))
+    assert (dest / "data.json").read_text() == src.read_text()
+
+
+def test_upload_objects_unknown_codec(s3_client, tmp_path):
+    s3_client.create_bucket(Bucket="compress-bucket")
+    src = tmp_path / "file.txt"
+    src.write_text("dummy content")
+    assert s3.upload_objects(s3_client, "compress-bucket", [str(src)], "lz4") is False
+
+
+def test_configure_applies_tuning(s3_client, monkeypatch):
+    monkeypatch.setattr(s3, "TRANSFER_CONFIG", s3.TRANSFER_CONFIG)
+    monkeypatch.setattr(s3, "LIST_PAGE_SIZE", s3.LIST_PAGE_SIZE)
+    s3.configure(
+        {
+            "multipart_threshold": 16 * 1024**2,
+            "multipart_chunksize": 16 * 1024**2,
+            "max_workers": 3,
+            "list_page_size": 2,
+        }
+    )
+    assert s3.TRANSFER_CONFIG.multipart_chunksize == 16 * 1024**2
+    assert s3.TRANSFER_CONFIG.max_request_concurrency == 3
+
+    s3_client.create_bucket(Bucket="paged-bucket")
+    for i in range(5):
+        s3_client.put_object(Bucket="paged-bucket", Key=f"k{i}", Body=b"x")
+    assert len(list(s3.iter_objects(s3_client, "paged-bucket"))) == 5
+
+
+def test_delete_buckets_removes_versions_and_uploads(s3_client):
+    names = [f"teardown-{i}" for i in range(4)]
+    for name in names:
+        s3_client.create_bucket(Bucket=name)
+    s3_client.put_bucket_versioning(
+        Bucket=names[0], VersioningConfiguration={"Status": "Enabled"}
+    )
+    for _ in range(3):
+        s3_client.put_object(Bucket=names[0], Key="versioned.txt", Body=b"v")
+    s3_client.delete_object(Bucket=names[0], Key="versioned.txt")
+    s3_client.create_multipart_upload(Bucket=names[1], Key="pending.bin")
+    for i in range(5):
+        s3_client.put_object(Bucket=names[2], Key=f"obj{i}", Body=b"x")
+
+    assert s3.delete_buckets(s3_client, names, max_workers=3) is True
+    remaining = [b["Name"] for b in s3_client.list_buckets()["Buckets"]]
+    assert not set(names) & set(remaining)
+
+
+def test_delete_buckets_reports_failure(s3_client):
+    s3_client.create_bucket(Bucket="teardown-ok")
+    assert s3.delete_buckets(s3_client, ["teardown-ok", "teardown-missing"]) is False
+    assert s3_client.list_buckets()["Buckets"] == []
+
+
+def test_expire_objects_filters_and_deletes(s3_client):
+    s3_client.create_bucket(Bucket="expire-bucket")
+    s3_client.put_object(Bucket="expire-bucket", Key="logs/big.log", Body=b"x" * 100)
+    s3_client.put_object(Bucket="expire-bucket", Key="logs/small.log", Body=b"x")
+    s3_client.put_object(Bucket="expire-bucket", Key="data/big.bin", Body=b"x" * 100)
+
+    assert s3.expire_objects(
+        s3_client, "expire-bucket", prefix="logs/", larger_than=10, dry_run=True
+    )
+    assert len(s3_client.list_objects_v2(Bucket="expire-bucket")["Contents"]) == 3
+
+    assert s3.expire_objects(s3_client, "expire-bucket", prefix="logs/", larger_than=10)
+    keys = [
+        o["Key"] for o in s3_client.list_objects_v2(Bucket="expire-bucket")["Contents"]
+    ]
+    assert keys == ["data/big.bin", "logs/small.log"]
+
+    # Nothing is old enough yet
+    assert s3.expire_objects(s3_client, "expire-bucket", older_than_days=1)
+    assert s3_client.list_objects_v2(Bucket="expire-bucket")["KeyCount"] == 2
+
+
+def test_expire_objects_transitions_storage_class(s3_client):
+    s3_client.create_bucket(Bucket="tier-bucket")
+    s3_client.put_object(Bucket="tier-bucket", Key="archive/a", Body=b"a")
+    s3_client.put_object(Bucket="tier-bucket", Key="keep/b", Body=b"b")
+
+    assert s3.expire_objects(
+        s3_client, "tier-bucket", prefix="archive/", transition_to="STANDARD_IA"
+    )
+    assert (
+        s3_client.head_object(Bucket="tier-bucket", Key="archive/a")["StorageClass"]
+        == "STANDARD_IA"
+    )
+    assert "StorageClass" not in s3_client.head_object(
+        Bucket="tier-bucket", Key="keep/b"
+    )
+
+    # Already tiered objects can be filtered out by storage class
+    matches = s3.iter_matching_objects(
+        s3_client, "tier-bucket", storage_classes=["STANDARD"]
+    )
+    assert [o["Key"] for o in matches] == ["keep/b"]
+
+
+def test_expire_objects_transition_refuses_versioned_bucket(s3_client):
+    s3_client.create_bucket(Bucket="tier-bucket")
+    s3_client.put_bucket_versioning(
+        Bucket="tier-bucket", VersioningConfiguration={"Status": "Enabled"}
+    )
+    s3_client.put_object(Bucket="tier-bucket", Key="archive/a", Body=b"a")
+
+    assert s3.expire_objects(
+        s3_client, "tier-bucket", transition_to="STANDARD_IA", dry_run=True
+    )
+    assert not s3.expire_objects(s3_client, "tier-bucket", transition_to="STANDARD_IA")
+    versions = s3_client.list_object_versions(Bucket="tier-bucket")["Versions"]
+    assert len(versions) == 1
+    assert "StorageClass" not in s3_client.head_object(
+        Bucket="tier-bucket", Key="archive/a"
+    )
+
+
+def test_lifecycle_rule_applied(s3_client):
+    s3_client.create_bucket(Bucket="rule-bucket")
+    with pytest.raises(ValueError):
+        s3.lifecycle_rule("r", prefix="logs/")
+
+    rule = s3.lifecycle_rule("r", prefix="logs/", older_than_days=30, larger_than=10)
+    assert rule["Filter"] == {"And": {"Prefix": "logs/", "ObjectSizeGreaterThan": 10}}
+    assert rule["Expiration"] == {"Days": 30}
+
+    assert s3.apply_lifecycle_rule(s3_client, "rule-bucket", rule)
+    tiered = s3.lifecycle_rule("r", older_than_days=90, transition_to="GLACIER")
+    assert s3.apply_lifecycle_rule(s3_client, "rule-bucket", tiered)
+    rules = s3_client.get_bucket_lifecycle_configuration(Bucket="rule-bucket")["Rules"]
+    assert len(rules) == 1
+    assert rules[0]["Transitions"][0]["StorageClass"] == "GLACIER"
+
+
+def test_expire_objects_transition_is_repeatable(s3_client):
+    s3_client.create_bucket(Bucket="tier-bucket")
+    s3_client.put_object(Bucket="tier-bucket", Key="archive/a", Body=b"a")
+    s3_client.put_object(
+        Bucket="tier-bucket", Key="archive/b", Body=b"b", StorageClass="DEEP_ARCHIVE"
+    )
+
+    assert s3.expire_objects(s3_client, "tier-bucket", transition_to="GLACIER")
+    assert s3.expire_objects(s3_client, "tier-bucket", transition_to="GLACIER")
+    heads = {
+        key: s3_client.head_object(Bucket="tier-bucket", Key=key)["StorageClass"]
+        for key in ("archive/a", "archive/b")
+    }
+    assert heads == {"archive/a": "GLACIER", "archive/b": "DEEP_ARCHIVE"}
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import pytest
+from botocore.exceptions import EndpointConnectionError
+from moto import mock_aws
+
+from aws_automation import s3, selector
+
+BUCKET = "selector-bucket"
+
+
+@pytest.fixture
+def s3_client():
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        for key in ["readme.txt", "logs/a.log", "logs/b.log", "logs/2025/c.log"]:
+            client.put_object(Bucket=BUCKET, Key=key, Body=b"x")
+        yield client
+
+
+class Prompt:
+    def __init__(self, answer):
+        self.answer = answer
+
+    def ask(self):
+        return self.answer
+
+
+def script_prompts(monkeypatch, selects, texts=(), checkboxes=(), defaults=None):
+    # Feed scripted answers to questionary; select answers are (action, value)
+    # tuples checked against the offered choices.
+    selects, texts, checkboxes = list(selects), list(texts), list(checkboxes)
+    seen = []
+
+    def select(message, choices, default=None):
+        offered = [c.value for c in choices if hasattr(c, "value")]
+        assert default is None or default in offered
+        if defaults is not None:
+            defaults.append(default)
+        seen.append(offered)
+        answer = selects.pop(0)
+        assert answer in offered
+        return Prompt(answer)
+
+    monkeypatch.setattr(selector.questionary, "select", select)
+    monkeypatch.setattr(
+        selector.questionary, "text", lambda *a, **k: Prompt(texts.pop(0))
+    )
+    monkeypatch.setattr(
+        selector.questionary, "checkbox", lambda *a, **k: Prompt(checkboxes.pop(0))
+    )
+    return seen
+
+
+def test_browse_objects_drill_down_and_toggle(s3_client, monkeypatch):
+    seen = script_prompts(
+        monkeypatch,
+        [
+            ("toggle", "readme.txt"),
+            ("cd", "logs/"),
+            ("toggle", "logs/a.log"),
+            ("up", None),
+            ("done", None),
+        ],
+    )
+    selected = selector.browse_objects(s3_client, BUCKET)
+    assert selected == ["logs/a.log", "readme.txt"]
+    assert ("cd", "logs/2025/") in seen[2]
+
+
+def test_browse_objects_pages_lazily(s3_client, monkeypatch):
+    for i in range(5):
+        s3_client.put_object(Bucket=BUCKET, Key=f"page/{i}.txt", Body=b"x")
+    script_prompts(
+        monkeypatch,
+        [
+            ("cd", "page/"),
+            ("all", None),
+            ("next", None),
+            ("toggle", "page/2.txt"),
+            ("prev", None),
+            ("done", None),
+        ],
+    )
+    selected = selector.browse_objects(s3_client, BUCKET, page_size=2)
+    assert selected == ["page/0.txt", "page/1.txt", "page/2.txt"]
+
+
+def test_browse_objects_fuzzy_search(s3_client, monkeypatch):
+    script_prompts(
+        monkeypatch,
+        [("search", None), ("done", None)],
+        texts=["lgc"],
+        checkboxes=[["logs/2025/c.log"]],
+    )
+    assert selector.browse_objects(s3_client, BUCKET) == ["logs/2025/c.log"]
+
+
+def test_browse_objects_cancel(s3_client, monkeypatch):
+    script_prompts(monkeypatch, [("toggle", "readme.txt"), ("cancel", None)])
+    assert selector.browse_objects(s3_client, BUCKET) == []
+
+
+def test_prompt_select_objects_empty_bucket(s3_client):
+    s3_client.create_bucket(Bucket="empty-bucket")
+    assert s3.prompt_select_objects(s3_client, "empty-bucket") == []
+
+
+def test_key_index_search_ranks_substring_first(s3_client):
+    with ThreadPoolExecutor() as executor:
+        index = selector.KeyIndex(s3_client, BUCKET, "", executor)
+        index.wait()
+    assert index.done
+    assert index.search("log")[:2] == ["logs/a.log", "logs/b.log"]
+    assert index.search("rdt") == ["readme.txt"]
+    assert index.search("zzz") == []
+
+
+def test_browse_objects_keeps_cursor_on_last_choice(s3_client, monkeypatch):
+    defaults = []
+    script_prompts(
+        monkeypatch,
+        [("toggle", "readme.txt"), ("cd", "logs/"), ("done", None)],
+        defaults=defaults,
+    )
+    selector.browse_objects(s3_client, BUCKET)
+    assert defaults == [None, ("toggle", "readme.txt"), None]
+
+
+def test_prompt_select_objects_handles_botocore_error(s3_client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise EndpointConnectionError(endpoint_url="https://s3.amazonaws.com")
+
+    monkeypatch.setattr(s3, "browse_objects", fail)
+    assert s3.prompt_select_objects(s3_client, BUCKET) == []
+
+
+def test_prefix_pager_adds_page_before_marking_done(s3_client):
+    # page() reads pages and done without the lock; done must never be seen
+    # before the last page is in place
+    class Pages(list):
+        def append(self, entries):
+            assert not pager.done
+            super().append(entries)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pager = selector.PrefixPager(s3_client, BUCKET, "", executor)
+        pager.pages = Pages()
+        assert pager.page(0)
+        assert pager.done
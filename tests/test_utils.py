@@ -1,14 +1,26 @@
+import os
 import pytest
 from unittest.mock import patch, mock_open
-from aws_automation.utils import load_config
+from aws_automation.utils import (
+    CREATE_FIELDS,
+    TUNING_DEFAULTS,
+    load_config,
+    run_concurrently,
+)
 
 # Sample config content as YAML string
 sample_config_yaml = """
 aws:
-  access_key_id: dummy
-  secret_access_key: dummy
+  region_name: us-east-2
+  instance_type: t2.micro
+  ami_id: ami-04f167a56786e4b09
+  key_name: dummy-key
+  security_group_name: dummy-sg
+  security_group_description: dummy
+  instance_name: dummy-instance
 s3:
   bucket_name: dummy-bucket
+  region_name: us-east-2
 """
 
 
@@ -48,3 +60,145 @@ aws:
 
         with pytest.raises(SystemExit):
             load_config()
+
+
+def test_run_concurrently_collects_results_and_errors():
+    def square(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x * x
+
+    results = {
+        item: (res, err) for item, res, err in run_concurrently(square, range(6), 2)
+    }
+    assert results[4] == (16, None)
+    assert isinstance(results[3][1], ValueError)
+    assert len(results) == 6
+
+
+PROFILE_CONFIG = """
+aws:
+  region_name: us-east-2
+  instance_type: t2.micro
+  ami_id: ami-04f167a56786e4b09
+  key_name: my-key
+  security_group_name: my-sg
+  security_group_description: test
+  instance_name: my-instance
+s3:
+  bucket_name: base-bucket
+  region_name: us-east-2
+tuning:
+  max_workers: 8
+profiles:
+  dev:
+    s3:
+      bucket_name: dev-bucket
+regions:
+  eu-west-1:
+    aws:
+      ami_id: ami-0123456789abcdef0
+"""
+
+
+def write_config(tmp_path, content):
+    path = tmp_path / "config.yaml"
+    path.write_text(content)
+    return str(path)
+
+
+def test_load_config_profile_region_and_tuning(tmp_path):
+    path = write_config(tmp_path, PROFILE_CONFIG)
+
+    config = load_config(path)
+    assert config["s3"]["bucket_name"] == "base-bucket"
+    assert config["tuning"]["max_workers"] == 8
+    assert config["tuning"]["list_page_size"] == TUNING_DEFAULTS["list_page_size"]
+
+    config = load_config(path, profile="dev", region="eu-west-1")
+    assert config["s3"]["bucket_name"] == "dev-bucket"
+    assert config["aws"]["region_name"] == "eu-west-1"
+    assert config["aws"]["ami_id"] == "ami-0123456789abcdef0"
+
+
+def test_load_config_env_overrides(tmp_path, monkeypatch):
+    path = write_config(tmp_path, PROFILE_CONFIG)
+    monkeypatch.setenv("AWS_AUTOMATION_CONFIG", path)
+    monkeypatch.setenv("AWS_AUTOMATION_PROFILE", "dev")
+    assert load_config()["s3"]["bucket_name"] == "dev-bucket"
+
+
+def test_load_config_is_cached_until_mtime_changes(tmp_path):
+    path = write_config(tmp_path, PROFILE_CONFIG)
+    load_config(path)
+
+    with patch("builtins.open", side_effect=AssertionError("re-read")):
+        config = load_config(path)
+    # Callers get their own copy, so mutating it cannot corrupt the cache
+    config["s3"]["bucket_name"] = "changed"
+    assert load_config(path)["s3"]["bucket_name"] == "base-bucket"
+
+    write_config(tmp_path, PROFILE_CONFIG.replace("base-bucket", "new-bucket"))
+    os.utime(path, (0, os.path.getmtime(path) + 10))
+    assert load_config(path)["s3"]["bucket_name"] == "new-bucket"
+
+
+@pytest.mark.parametrize(
+    "old, new",
+    [
+        ("instance_type: t2.micro", "instance_type: 42"),
+        ("ami_id: ami-04f167a56786e4b09", "ami_id: img-1"),
+        ("max_workers: 8", "max_workers: 0"),
+        ("bucket_name: base-bucket", "bucket_name: Bad_Bucket"),
+    ],
+)
+def test_load_config_rejects_invalid_fields(tmp_path, old, new):
+    path = write_config(tmp_path, PROFILE_CONFIG.replace(old, new, 1))
+    with pytest.raises(SystemExit):
+        load_config(path)
+
+
+def test_load_config_unknown_profile(tmp_path):
+    path = write_config(tmp_path, PROFILE_CONFIG)
+    with pytest.raises(SystemExit):
+        load_config(path, profile="prod")
+
+
+S3_ONLY_CONFIG = """
+aws:
+  region_name: us-east-2
+s3:
+  bucket_name: base-bucket
+  region_name: us-east-2
+"""
+
+
+def test_load_config_s3_only_config(tmp_path):
+    path = write_config(tmp_path, S3_ONLY_CONFIG)
+    assert load_config(path, required=("s3.bucket_name",))["s3"]["bucket_name"]
+
+
+@pytest.mark.parametrize(
+    "content, required",
+    [
+        (S3_ONLY_CONFIG, CREATE_FIELDS),
+        (
+            S3_ONLY_CONFIG.replace("  bucket_name: base-bucket\n", ""),
+            ("s3.bucket_name",),
+        ),
+        (S3_ONLY_CONFIG.replace("aws:\n  region_name: us-east-2", "aws: {}"), ()),
+    ],
+)
+def test_load_config_rejects_missing_required_field(
+    tmp_path, content, required, caplog
+):
+    with pytest.raises(SystemExit):
+        load_config(write_config(tmp_path, content), required=required)
+    assert "Missing required field" in caplog.text
+
+
+def test_load_config_missing_file_names_path(tmp_path, caplog):
+    path = str(tmp_path / "elsewhere.yaml")
+    with pytest.raises(SystemExit):
+        load_config(path)
+    assert path in caplog.text